@@ -1,5 +1,18 @@
-import os, uuid, threading, time, datetime, signal
-from flask import Flask, request, send_file, jsonify
+import os, re, uuid, shutil, threading, time, datetime, signal, traceback, subprocess, logging, socket, heapq, mimetypes, multiprocessing
+from logging.handlers import RotatingFileHandler
+from collections import Counter, namedtuple
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+from openpyxl import load_workbook
+from flask import Flask, request, send_file, jsonify, g
 
 # Handle "[Errno 32] Broken pipe" gracefully in Unix-like environments (Mac/Linux)
 try:
@@ -10,27 +23,279 @@ from werkzeug.utils import secure_filename
 from utils.screenshot import capture_screenshot
 from utils.image_compare import compare_images
 from utils.report import build_pdf_report
+from utils.visual_check import compare_and_report
 from utils.jira_client import JiraClient
+from utils.pagespeed import PageSpeedInsights
+from utils.seo_performance_report import generate_seo_performance_pdf
+from utils.report_writer import write_batch_reports
+from utils.sitemap_parser import fetch_sitemap_urls, iter_sitemap_urls
+from utils.semantic_validator import validate_html_semantics
+from utils.semantic_report import generate_semantic_report
+from utils.accessibility_report import generate_accessibility_pdf
+from utils.crawler import ImageIconCrawler, LinkCrawler, generate_excel_report, global_status_cache
+from utils.overlapping_crawler import OverlappingBreakingCrawler
+from utils.functional_test_engine import FunctionalTestEngine, generate_functional_report_pdf
+from utils.config_cache import load_json_config, save_json_config
+from utils.pr_runs import make_pr_run_tracking
+from utils.git_ops import GitOpError, open_repo as open_git_repo
+from utils.github_client import (
+    create_issue as create_gh_issue, list_open_prs, get_pr_info, build_pr_comment,
+    post_commit_status, finalize_pr, verify_webhook_signature, STATUS_CONTEXT
+)
+
+try:
+    from utils.pagespeed_async import analyze_urls as analyze_urls_async
+except ImportError:
+    # aiohttp not installed: batch PSI runs fall back to the thread pool
+    analyze_urls_async = None
+
+try:
+    from utils.json_provider import OrjsonProvider
+except ImportError:
+    # orjson not installed: keep Flask's default JSON provider
+    OrjsonProvider = None
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
+if OrjsonProvider is not None:
+    app.json = OrjsonProvider(app)
+# Reject oversized uploads from the Content-Length header, before reading the body
+app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_UPLOAD_MB", 100)) * 1024 * 1024
+# send_file hands files to the server's wsgi.file_wrapper (sendfile(2) under
+# gunicorn). Behind a proxy the body can be skipped entirely: USE_X_SENDFILE for
+# Apache/lighttpd, or X_ACCEL_RUNS_PREFIX (an nginx `internal` location aliased
+# to runs/) for job downloads
+app.config["USE_X_SENDFILE"] = bool(os.environ.get("USE_X_SENDFILE"))
+X_ACCEL_RUNS_PREFIX = os.environ.get("X_ACCEL_RUNS_PREFIX", "").rstrip("/")
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RUNS_DIR = os.path.join(BASE_DIR, "runs")
 os.makedirs(RUNS_DIR, exist_ok=True)
 
 ALLOWED_EXT = {"png"}
 
-
-from utils.store import store
+# Failed jobs store a one-line error; the full traceback goes to a rotating
+# jobs.log (and into the job as well in debug mode or with QA_VERBOSE_ERRORS)
+VERBOSE_ERRORS = bool(os.environ.get("QA_VERBOSE_ERRORS"))
+logger = logging.getLogger("qa_jobs")
+logger.setLevel(logging.INFO)
+_log_handler = RotatingFileHandler(os.path.join(BASE_DIR, "jobs.log"), maxBytes=5 * 1024 * 1024, backupCount=3)
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+logger.addHandler(_log_handler)
+
+
+def _short_err(e):
+    if VERBOSE_ERRORS or app.debug:
+        return f"{str(e)}\n{traceback.format_exc()}"
+    return f"{type(e).__name__}: {e}"
+
+# Shared, bounded worker pools. JOB_POOL runs background job orchestration;
+# PSI_POOL runs the blocking PageSpeed Insights calls for every job, so
+# concurrent batches share one rate-limited set of threads.
+PSI_WORKERS = int(os.environ.get("PSI_WORKERS", 8))
+JOB_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get("JOB_WORKERS", 16)), thread_name_prefix="job")
+PSI_POOL = ThreadPoolExecutor(max_workers=PSI_WORKERS, thread_name_prefix="psi")
+# DELETE_POOL removes deleted jobs' folders, on its own threads so a delete
+# never waits behind long-running jobs on JOB_POOL
+DELETE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="delete")
+# PDF_POOL renders reportlab PDFs (and visual diffs) in worker processes, off
+# the GIL, after the job has already been reported as completed. Workers come
+# from a forkserver, never a fork of this threaded process, which could copy a
+# lock (logging, JobStore) some other thread holds. The server preloads only
+# the modules the submitted functions live in, not this app.
+_PDF_MP = multiprocessing.get_context("forkserver")
+_PDF_MP.set_forkserver_preload(["utils.semantic_report", "utils.functional_test_engine", "utils.visual_check"])
+PDF_POOL = ProcessPoolExecutor(max_workers=int(os.environ.get("PDF_WORKERS", min(4, os.cpu_count() or 1))),
+                               mp_context=_PDF_MP)
+
+
+from utils.store import store, ProgressThrottle
+from utils.psi_cache import psi_cache
 from utils.baseline_store import BaselineStore
 
 baseline_store = BaselineStore(data_dir=os.path.join(RUNS_DIR, "baselines"), metadata_file=os.path.join(RUNS_DIR, "baselines.json"))
 
 
+# A PDF still pending after this many seconds is reported as failed: the
+# render's done callback only lives in this process, so a restart mid-render
+# would otherwise leave the job pending forever
+PDF_PENDING_TIMEOUT = int(os.environ.get("PDF_PENDING_TIMEOUT", 600))
+
+
+def _mark_pdf_pending(result):
+    """Flag a completed job's result as still waiting for its PDF."""
+    result["pdf_report_url"] = None
+    result["pdf_pending"] = True
+    result["pdf_pending_since"] = time.time()
+
+
+def _render_pdf_async(job_id, render, *args):
+    """
+    Run render(*args) on PDF_POOL for a job that was saved as completed with a
+    result flagged by _mark_pdf_pending. When the PDF is written, the job's
+    result gets its pdf_report_url (or pdf_error) and pdf_pending is cleared.
+    """
+    def on_done(future):
+        job = store.get_job(job_id)
+        if job is None:
+            return  # Deleted while rendering
+        result = dict(job.get("result") or {})
+        result.pop("pdf_pending", None)
+        result.pop("pdf_pending_since", None)
+        try:
+            result["pdf_report_url"] = f"/download/{job_id}/{os.path.basename(future.result())}"
+            result.pop("pdf_error", None)
+        except Exception as pdf_err:
+            result["pdf_error"] = str(pdf_err)
+        store.save_job(job_id, {"result": result})
+
+    PDF_POOL.submit(render, *args).add_done_callback(on_done)
+
+
+def _expire_pdf_pending(job_id, job):
+    """
+    Return `job` with a pdf_pending flag older than PDF_PENDING_TIMEOUT
+    replaced by a pdf_error (also saved to the store).
+    """
+    result = job.get("result")
+    if not isinstance(result, dict) or not result.get("pdf_pending"):
+        return job
+    if time.time() - result.get("pdf_pending_since", 0) < PDF_PENDING_TIMEOUT:
+        return job
+    result = dict(result)
+    result.pop("pdf_pending", None)
+    result.pop("pdf_pending_since", None)
+    result["pdf_error"] = "PDF report did not finish rendering"
+    store.save_job(job_id, {"result": result})
+    return {**job, "result": result}
+
+
 
 
 def allowed_file(fn):
     return "." in fn and fn.rsplit(".", 1)[1].lower() in ALLOWED_EXT
 
+
+# Job ids are generated here (uuid4 prefixes, "c_<hex>", "pr<n>_<hex>"), so an
+# id outside this pattern can't name a job folder and is rejected outright
+_JID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def _job_dir(job_id):
+    """Path of a job's folder under RUNS_DIR, or None if job_id isn't a valid id."""
+    job_id = str(job_id)
+    if not _JID_RE.match(job_id):
+        return None
+    return f"{RUNS_DIR}{os.sep}{job_id}"
+
+
+def _link_or_copy(src, dst):
+    """
+    Hardlink a baseline image into a job folder, copying only when a link
+    isn't possible (different filesystem). Baseline files are never rewritten
+    in place, so the job's copy can't change under it.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _list_job_dir(job_id):
+    """
+    Return {filename: DirEntry} for a job directory.
+    The directory is scanned once per request and cached on `g`, so repeated
+    existence checks against the same job don't each cost a stat() call.
+    """
+    cache = g.setdefault("_job_dirs", {})
+    if job_id not in cache:
+        job_dir = _job_dir(job_id)
+        cache[job_id] = {}
+        # An invalid id has no folder; never fall through to os.scandir(None),
+        # which would list the current directory
+        if job_dir is not None:
+            try:
+                with os.scandir(job_dir) as it:
+                    cache[job_id] = {e.name: e for e in it}
+            except (FileNotFoundError, NotADirectoryError):
+                pass
+    return cache[job_id]
+
+
+# Folders under RUNS_DIR whose names pass _JID_RE but aren't job folders
+_RESERVED_RUN_DIRS = frozenset({"baselines"})
+
+
+def _remove_job_dirs(job_ids):
+    """
+    Delete job folders in the background on DELETE_POOL, so a bulk delete
+    doesn't hold the request while every screenshot/PDF tree is walked.
+    """
+    for job_id in job_ids:
+        job_dir = _job_dir(job_id)
+        if job_dir and str(job_id) not in _RESERVED_RUN_DIRS:
+            DELETE_POOL.submit(shutil.rmtree, job_dir, ignore_errors=True)
+
+
+def _delete_jobs(job_ids):
+    """
+    Drop jobs from history and queue their folders for removal. Returns the
+    response every history delete endpoint sends: 202, since the folders are
+    still being removed.
+    """
+    store.delete_jobs(job_ids)
+    _remove_job_dirs(job_ids)
+    return jsonify({"success": True, "message": f"Deleted {len(job_ids)} job(s)"}), 202
+
+
+# Job folders (screenshots, reports) older than this many days are removed along
+# with their history entry; 0 keeps them forever
+JOB_RETENTION_DAYS = float(os.environ.get("JOB_RETENTION_DAYS", 0))
+JOB_RETENTION_INTERVAL = 6 * 3600  # seconds between cleanup passes
+
+
+def _purge_old_job_dirs(max_age_days):
+    """
+    Remove job folders under RUNS_DIR not modified for max_age_days, and their
+    history entries. Baselines and jobs still running are left alone.
+
+    Returns:
+        List of purged job ids
+    """
+    cutoff = time.time() - max_age_days * 86400
+    old_ids = []
+    with os.scandir(RUNS_DIR) as it:
+        for entry in it:
+            if entry.name in _RESERVED_RUN_DIRS or not _JID_RE.match(entry.name):
+                continue
+            if entry.is_dir(follow_symlinks=False) and entry.stat().st_mtime < cutoff:
+                old_ids.append(entry.name)
+
+    old_ids = [jid for jid in old_ids if (store.get_job(jid) or {}).get("status") != "running"]
+    if old_ids:
+        store.delete_jobs(old_ids)
+        _remove_job_dirs(old_ids)
+        logger.info("Purged %d job folders older than %s days", len(old_ids), max_age_days)
+    return old_ids
+
+
+def _job_retention_loop():
+    while True:
+        time.sleep(JOB_RETENTION_INTERVAL)
+        try:
+            _purge_old_job_dirs(JOB_RETENTION_DAYS)
+        except Exception:
+            logger.exception("Job folder cleanup failed")
+
+
+# Not in PDF_POOL workers, which import this module as their __main__ when the
+# app is run directly
+if JOB_RETENTION_DAYS > 0 and multiprocessing.parent_process() is None:
+    threading.Thread(target=_job_retention_loop, name="job-retention", daemon=True).start()
+
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    return jsonify({"error": f"Upload too large (limit {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB)"}), 413
+
 @app.post("/api/compare")
 def compare():
     """
@@ -52,7 +317,6 @@ def compare():
     # Save stage_url in job data immediately so it's available for approval
     store.save_job(job_id, {"status": "starting", "progress": 0, "step": "Initializing", "stage_url": stage_url})
 
-    import shutil
     figma_path = os.path.join(job_dir, "figma.png")
     uploaded_file = request.files.get("figma_png")
 
@@ -60,7 +324,7 @@ def compare():
         # No file - try to use stored baseline
         baseline_path = baseline_store.get_active_baseline_path(stage_url)
         if baseline_path and os.path.exists(baseline_path):
-            shutil.copy2(baseline_path, figma_path)
+            _link_or_copy(baseline_path, figma_path)
             reference_source = "baseline"
         else:
             return jsonify({"error": "No baseline image uploaded and no active baseline found for this URL."}), 400
@@ -179,8 +443,6 @@ def check_broken_links():
 
 def process_broken_links(job_id, stage_url, check_type, job_dir):
     try:
-        from utils.crawler import ImageIconCrawler, LinkCrawler, generate_excel_report, global_status_cache
-        
         # Clear cache for fresh check
         global_status_cache.clear()
         
@@ -203,7 +465,6 @@ def process_broken_links(job_id, stage_url, check_type, job_dir):
         elif check_type == "overlapping_breaking":
             # Run overlapping and breaking detection
             try:
-                from utils.overlapping_crawler import OverlappingBreakingCrawler
                 store.save_job(job_id, {"step": "Checking overlapping & breaking...", "progress": 30})
                 overlap_crawler = OverlappingBreakingCrawler(stage_url)
                 broken_assets = overlap_crawler.run()
@@ -227,7 +488,6 @@ def process_broken_links(job_id, stage_url, check_type, job_dir):
 
             # Add overlapping and breaking detection
             try:
-                from utils.overlapping_crawler import OverlappingBreakingCrawler
                 store.save_job(job_id, {"step": "Checking overlapping & breaking...", "progress": 60})
                 overlap_crawler = OverlappingBreakingCrawler(stage_url)
                 overlapping_issues = overlap_crawler.run()
@@ -272,9 +532,8 @@ def process_broken_links(job_id, stage_url, check_type, job_dir):
 
 @app.get("/api/broken-links/history")
 def get_broken_links_history():
-    jobs = store.list_jobs()
-    # Filter only broken_links jobs (and legacy comprehensive_audit)
-    broken_links_jobs = [j for j in jobs if j.get("type") in ["broken_links", "comprehensive_audit"]]
+    # Only broken_links jobs (and legacy comprehensive_audit)
+    job_types = ["broken_links", "comprehensive_audit"]
     
     # Pagination
     try:
@@ -288,13 +547,13 @@ def get_broken_links_history():
     if limit < 1: limit = 10
 
     start = (page - 1) * limit
-    end = start + limit
     
-    paginated_jobs = broken_links_jobs[start:end]
+    # Filtering and slicing happen inside the store
+    paginated_jobs = store.list_jobs(job_type=job_types, offset=start, limit=limit)
     
     return jsonify({
         "jobs": paginated_jobs,
-        "total": len(broken_links_jobs),
+        "total": store.count_jobs(job_type=job_types),
         "page": page,
         "limit": limit
     })
@@ -308,15 +567,7 @@ def delete_broken_links_history():
     if not job_ids:
         return jsonify({"error": "No job IDs provided"}), 400
     
-    for job_id in job_ids:
-        store.delete_job(job_id)
-        # Also delete the job directory
-        job_dir = os.path.join(RUNS_DIR, job_id)
-        if os.path.exists(job_dir):
-            import shutil
-            shutil.rmtree(job_dir)
-    
-    return jsonify({"message": f"Deleted {len(job_ids)} job(s)"}), 200
+    return _delete_jobs(job_ids)
 
 
 
@@ -329,14 +580,12 @@ def process_comparison(job_id, figma_path, stage_url, viewport, fullpage, thresh
         mask_selectors = []
         if ignore_selectors_str:
             # Handle comma or newline separated
-            import re
             parts = re.split(r'[,\n\r]+', ignore_selectors_str)
             mask_selectors = [p.strip() for p in parts if p.strip()]
 
         # Parse remove selectors (completely remove from DOM - display:none)
         remove_sels = []
         if remove_selectors_str:
-            import re
             parts = re.split(r'[,\n\r]+', remove_selectors_str)
             remove_sels = [p.strip() for p in parts if p.strip()]
 
@@ -412,7 +661,7 @@ def get_status(job_id):
     job = store.get_job(job_id)
     if not job:
         return jsonify({"error": "Job not found"}), 404
-    return jsonify(job)
+    return jsonify(_expire_pdf_pending(job_id, job))
 
 
 @app.post("/api/job/<job_id>/approve")
@@ -425,13 +674,10 @@ def approve_job(job_id):
     
     # Also Promote to Baseline
     # We need the job data to know where the stage image is
-    job_dir = os.path.join(RUNS_DIR, job_id)
-    stage_path = os.path.join(job_dir, "stage.png")
-    
     # We need the original stage URL from the job
     # But job object from store might not have clean URL if it was just an adhoc run
     # Let's check job_data
-    if os.path.exists(stage_path):
+    if "stage.png" in _list_job_dir(job_id):
         # We need to find the URL this run was for.
         # It's recorded in the job report usually but maybe not in store metadata explicitly if not added
         # compare_images stores result in job_dir but we need URL
@@ -455,14 +701,13 @@ def promote_baseline(job_id):
     if not stage_url:
         return jsonify({"error": "Job does not have a stage_url recorded."}), 400
         
-    job_dir = os.path.join(RUNS_DIR, job_id)
     # Use figma.png (the reference/uploaded file) as the new baseline source
-    figma_path = os.path.join(job_dir, "figma.png")
+    figma_entry = _list_job_dir(job_id).get("figma.png")
     
-    if not os.path.exists(figma_path):
+    if figma_entry is None:
         return jsonify({"error": "Reference image (figma.png) missing."}), 404
         
-    version_id = baseline_store.add_baseline(stage_url, job_id, figma_path)
+    version_id = baseline_store.add_baseline(stage_url, job_id, figma_entry.path)
     
     # Also mark the job as approved since it is now the baseline
     store.save_job(job_id, {"approved": True, "reviewed_at": datetime.datetime.utcnow().isoformat()})
@@ -503,9 +748,8 @@ def reject_job(job_id):
 
 @app.get("/api/history")
 def get_history():
-    jobs = store.list_jobs()
-    # Filter only visual_testing jobs (exclude broken_links, accessibility, seo_performance)
-    visual_testing_jobs = [j for j in jobs if j.get("type") == "visual_testing"]
+    # Only visual_testing jobs (exclude broken_links, accessibility, seo_performance)
+    visual_testing_jobs = store.list_jobs(job_type="visual_testing")
     
     # Sort by timestamp (newest first)
     visual_testing_jobs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
@@ -549,12 +793,17 @@ def get_history():
 
 @app.get("/download/<job_id>/<filename>")
 def download(job_id, filename):
-    job_dir = os.path.join(RUNS_DIR, secure_filename(job_id))
-    file_path = os.path.join(job_dir, secure_filename(filename))
-    if not os.path.exists(file_path):
+    if _job_dir(job_id) is None:
+        return jsonify({"error": "Invalid job id"}), 400
+    entry = _list_job_dir(job_id).get(secure_filename(filename))
+    if entry is None or not entry.is_file():
         return jsonify({"error": "Not found"}), 404
     # Serve inline so <img src> previews work; UI uses download attribute for saving
-    return send_file(file_path, as_attachment=False)
+    if X_ACCEL_RUNS_PREFIX:
+        resp = app.response_class(mimetype=mimetypes.guess_type(entry.name)[0] or "application/octet-stream")
+        resp.headers["X-Accel-Redirect"] = f"{X_ACCEL_RUNS_PREFIX}/{job_id}/{entry.name}"
+        return resp
+    return send_file(entry.path, as_attachment=False, conditional=True)
 
 @app.get("/api/baselines/image/<filename>")
 def get_baseline_image(filename):
@@ -606,11 +855,17 @@ def review():
 
 CI_VISUAL_CONFIG_FILE = os.path.join(BASE_DIR, "ci_visual_config.json")
 
+def _load_ci_config():
+    # Re-parsed only when the file's mtime/size changes; None if there's no config yet
+    cfg = load_json_config(CI_VISUAL_CONFIG_FILE)
+    return cfg if cfg or os.path.exists(CI_VISUAL_CONFIG_FILE) else None
+
+
 @app.get("/api/ci/config")
 def get_ci_config():
-    if os.path.exists(CI_VISUAL_CONFIG_FILE):
-        with open(CI_VISUAL_CONFIG_FILE) as f:
-            return jsonify(json.load(f))
+    cfg = _load_ci_config()
+    if cfg is not None:
+        return jsonify(cfg)
     return jsonify({"error": "No config found"}), 404
 
 @app.post("/api/ci/config")
@@ -618,8 +873,8 @@ def save_ci_config():
     data = request.get_json()
     if not data:
         return jsonify({"error": "No data"}), 400
-    with open(CI_VISUAL_CONFIG_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    # Written to a temp file and swapped in, so readers never see a partial file
+    save_json_config(CI_VISUAL_CONFIG_FILE, data)
     return jsonify({"success": True})
 
 
@@ -679,10 +934,79 @@ def run_accessibility_test():
     return jsonify({"job_id": job_id})
 
 
+# Static metadata for each accessibility rule; checks only supply the variable parts.
+RuleSpec = namedtuple("RuleSpec", ["rule", "severity", "impact", "description", "element_tmpl", "fix_tmpl"])
+
+RULE_SPECS = {
+    "img_alt": RuleSpec(
+        rule="Missing alt text on image", severity="violation", impact="Critical",
+        description="Images must have alternate text for screen readers",
+        element_tmpl="<img src='{src}'>",
+        fix_tmpl="Add alt attribute: <img src='{src}' alt='Descriptive text'>"),
+    "input_label": RuleSpec(
+        rule="Form input missing label", severity="violation", impact="Critical",
+        description="Form elements must have associated labels",
+        element_tmpl="<input type='{input_type}' name='{input_name}'>",
+        fix_tmpl="Add <label for='{input_name}'>Label text:</label> before the input"),
+    "page_title": RuleSpec(
+        rule="Missing or empty page title", severity="violation", impact="Serious",
+        description="Pages must have a descriptive title",
+        element_tmpl="<title></title>",
+        fix_tmpl="Add <title>Descriptive Page Title</title> in the <head> section"),
+    "html_lang": RuleSpec(
+        rule="Missing language attribute", severity="violation", impact="Serious",
+        description="HTML element must have a lang attribute",
+        element_tmpl="<html>",
+        fix_tmpl="Add lang attribute: <html lang='en'>"),
+    "h1_missing": RuleSpec(
+        rule="Missing H1 heading", severity="warning", impact="Moderate",
+        description="Page should have exactly one H1 heading",
+        element_tmpl="N/A",
+        fix_tmpl="Add a single <h1> heading that describes the main content"),
+    "h1_multiple": RuleSpec(
+        rule="Multiple H1 headings", severity="warning", impact="Moderate",
+        description="Page should have only one H1 heading",
+        element_tmpl="{h1_count} H1 tags found",
+        fix_tmpl="Use only one <h1> and use <h2>, <h3> for subheadings"),
+    "heading_skip": RuleSpec(
+        rule="Skipped heading level", severity="warning", impact="Moderate",
+        description="Heading levels should not be skipped",
+        element_tmpl="<h{prev}> followed by <h{next}>",
+        fix_tmpl="Use heading levels in sequential order (h1, h2, h3, etc.)"),
+    "link_text": RuleSpec(
+        rule="Non-descriptive link text", severity="warning", impact="Moderate",
+        description="Link text should describe the destination",
+        element_tmpl="<a href='{href}'>{text}</a>",
+        fix_tmpl="Use descriptive text like 'Read more about [topic]' instead of 'Click here'"),
+    "button_name": RuleSpec(
+        rule="Button without accessible name", severity="violation", impact="Critical",
+        description="Buttons must have accessible text or aria-label",
+        element_tmpl="{markup}",
+        fix_tmpl="Add text inside button or aria-label attribute"),
+    "viewport_meta": RuleSpec(
+        rule="Missing viewport meta tag", severity="warning", impact="Moderate",
+        description="Page should include viewport meta tag for mobile responsiveness",
+        element_tmpl="<head>",
+        fix_tmpl="Add <meta name='viewport' content='width=device-width, initial-scale=1'> in <head>"),
+}
+
+
+_NON_DESCRIPTIVE_LINK_TEXTS = frozenset({'click here', 'read more', 'more', 'link', 'here'})
+
+
+def _make_issue(rule_key, **fields):
+    spec = RULE_SPECS[rule_key]
+    return {
+        "rule": spec.rule,
+        "severity": spec.severity,
+        "element": spec.element_tmpl.format(**fields),
+        "description": spec.description,
+        "impact": spec.impact,
+        "fix": spec.fix_tmpl.format(**fields)
+    }
+
+
 def analyze_page_accessibility(page_url):
-    import requests
-    from bs4 import BeautifulSoup
-    
     # Fetch the page
     headers = {'User-Agent': 'Mozilla/5.0 (compatible; VisualTestingBot/1.0)'}
     response = requests.get(page_url, headers=headers, timeout=30)
@@ -695,15 +1019,7 @@ def analyze_page_accessibility(page_url):
     images = soup.find_all('img')
     for img in images:
         if not img.get('alt'):
-            src = img.get('src', 'unknown')
-            issues.append({
-                "rule": "Missing alt text on image",
-                "severity": "violation",
-                "element": f"<img src='{src}'>",
-                "description": "Images must have alternate text for screen readers",
-                "impact": "Critical",
-                "fix": f"Add alt attribute: <img src='{src}' alt='Descriptive text'>"
-            })
+            issues.append(_make_issue("img_alt", src=img.get('src', 'unknown')))
     
     # Check 2: Form inputs without labels
     inputs = soup.find_all(['input', 'textarea', 'select'])
@@ -729,90 +1045,49 @@ def analyze_page_accessibility(page_url):
                 has_label = True
             
             if not has_label:
-                issues.append({
-                    "rule": "Form input missing label",
-                    "severity": "violation",
-                    "element": f"<input type='{input_type}' name='{input_name}'>",
-                    "description": "Form elements must have associated labels",
-                    "impact": "Critical",
-                    "fix": f"Add <label for='{input_name}'>Label text:</label> before the input"
-                })
+                issues.append(_make_issue("input_label", input_type=input_type, input_name=input_name))
     
     # Check 3: Missing page title
     title = soup.find('title')
     if not title or not title.string or len(title.string.strip()) == 0:
-        issues.append({
-            "rule": "Missing or empty page title",
-            "severity": "violation",
-            "element": "<title></title>",
-            "description": "Pages must have a descriptive title",
-            "impact": "Serious",
-            "fix": "Add <title>Descriptive Page Title</title> in the <head> section"
-        })
+        issues.append(_make_issue("page_title"))
     
     # Check 4: Missing lang attribute
     html_tag = soup.find('html')
     if html_tag and not html_tag.get('lang'):
-        issues.append({
-            "rule": "Missing language attribute",
-            "severity": "violation",
-            "element": "<html>",
-            "description": "HTML element must have a lang attribute",
-            "impact": "Serious",
-            "fix": "Add lang attribute: <html lang='en'>"
-        })
+        issues.append(_make_issue("html_lang"))
     
     # Check 5: Heading hierarchy
     headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
     h1_count = len(soup.find_all('h1'))
     
     if h1_count == 0:
-        issues.append({
-            "rule": "Missing H1 heading",
-            "severity": "warning",
-            "element": "N/A",
-            "description": "Page should have exactly one H1 heading",
-            "impact": "Moderate",
-            "fix": "Add a single <h1> heading that describes the main content"
-        })
+        issues.append(_make_issue("h1_missing"))
     elif h1_count > 1:
-        issues.append({
-            "rule": "Multiple H1 headings",
-            "severity": "warning",
-            "element": f"{h1_count} H1 tags found",
-            "description": "Page should have only one H1 heading",
-            "impact": "Moderate",
-            "fix": "Use only one <h1> and use <h2>, <h3> for subheadings"
-        })
+        issues.append(_make_issue("h1_multiple", h1_count=h1_count))
     
     # Check for skipped heading levels
     heading_levels = [int(h.name[1]) for h in headings]
     for i in range(len(heading_levels) - 1):
         if heading_levels[i+1] - heading_levels[i] > 1:
-            issues.append({
-                "rule": "Skipped heading level",
-                "severity": "warning",
-                "element": f"<h{heading_levels[i]}> followed by <h{heading_levels[i+1]}>",
-                "description": "Heading levels should not be skipped",
-                "impact": "Moderate",
-                "fix": "Use heading levels in sequential order (h1, h2, h3, etc.)"
-            })
+            issues.append(_make_issue("heading_skip", prev=heading_levels[i], next=heading_levels[i+1]))
             break
     
     # Check 6: Links with non-descriptive text
     links = soup.find_all('a', href=True)
-    non_descriptive_texts = ['click here', 'read more', 'more', 'link', 'here']
     for link in links:
-        link_text = link.get_text().strip().lower()
-        if link_text in non_descriptive_texts:
-            issues.append({
-                "rule": "Non-descriptive link text",
-                "severity": "warning",
-                "element": f"<a href='{link.get('href', '')}'>{link_text}</a>",
-                "description": "Link text should describe the destination",
-                "impact": "Moderate",
-                "fix": "Use descriptive text like 'Read more about [topic]' instead of 'Click here'"
-            })
+        if not link.contents:
+            continue
+        # .string is O(1); only walk the subtree when the anchor holds several
+        # bare text nodes and no child elements
+        raw = link.string
+        if raw is None:
+            if link.find(True) is not None:
+                continue
+            raw = link.get_text()
+        link_text = raw.strip().lower()
+        if link_text in _NON_DESCRIPTIVE_LINK_TEXTS:
+            issues.append(_make_issue("link_text", href=link.get('href', ''), text=link_text))
     
     # Check 7: Buttons without accessible names
     buttons = soup.find_all('button')
@@ -821,26 +1096,12 @@ def analyze_page_accessibility(page_url):
         aria_label = button.get('aria-label', '').strip()
         
         if not button_text and not aria_label:
-            issues.append({
-                "rule": "Button without accessible name",
-                "severity": "violation",
-                "element": str(button),
-                "description": "Buttons must have accessible text or aria-label",
-                "impact": "Critical",
-                "fix": "Add text inside button or aria-label attribute"
-            })
+            issues.append(_make_issue("button_name", markup=str(button)))
     
     # Check 8: Missing meta viewport for mobile
     viewport = soup.find('meta', {'name': 'viewport'})
     if not viewport:
-        issues.append({
-            "rule": "Missing viewport meta tag",
-            "severity": "warning",
-            "element": "<head>",
-            "description": "Page should include viewport meta tag for mobile responsiveness",
-            "impact": "Moderate",
-            "fix": "Add <meta name='viewport' content='width=device-width, initial-scale=1'> in <head>"
-        })
+        issues.append(_make_issue("viewport_meta"))
 
     return issues
 
@@ -852,14 +1113,14 @@ def process_accessibility_test(job_id, page_url, wcag_level, job_dir):
         
         store.save_job(job_id, {"step": "Counting issues...", "progress": 70})
         
-        violations = sum(1 for i in issues if i.get('severity') == 'violation')
-        warnings = sum(1 for i in issues if i.get('severity') == 'warning')
-        notices = sum(1 for i in issues if i.get('severity') == 'notice')
+        severity_counts = Counter(i.get('severity', '') for i in issues)
+        violations = severity_counts['violation']
+        warnings = severity_counts['warning']
+        notices = severity_counts['notice']
         
         store.save_job(job_id, {"step": "Generating PDF report...", "progress": 85})
         
         # Generate PDF report
-        from utils.accessibility_report import generate_accessibility_pdf
         report_path = generate_accessibility_pdf(issues, page_url, wcag_level, job_id, job_dir)
         
         final_result = {
@@ -878,14 +1139,12 @@ def process_accessibility_test(job_id, page_url, wcag_level, job_dir):
         })
         
     except Exception as e:
-        import traceback
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {"status": "failed", "error": error_details})
 
 def process_accessibility_sitemap(job_id, sitemap_url, wcag_level, job_dir):
     try:
-        from utils.sitemap_parser import fetch_sitemap_urls
-        from concurrent.futures import ThreadPoolExecutor, as_completed
         
         store.save_job(job_id, {"step": "Fetching sitemap URLs...", "progress": 5})
         
@@ -901,6 +1160,7 @@ def process_accessibility_sitemap(job_id, sitemap_url, wcag_level, job_dir):
         
         all_issues = []
         completed = 0
+        throttle = ProgressThrottle(job_id)
         
         # Determine strict or lenient timeout based on page count
         # Use 5 workers
@@ -920,16 +1180,17 @@ def process_accessibility_sitemap(job_id, sitemap_url, wcag_level, job_dir):
                 
                 completed += 1
                 progress = 10 + int((completed / total_pages) * 80)
-                store.save_job(job_id, {"step": f"Analyzed {completed}/{total_pages} pages...", "progress": progress})
+                throttle.update(step=f"Analyzed {completed}/{total_pages} pages...", progress=progress)
 
-        store.save_job(job_id, {"step": "Generating Combined Report...", "progress": 90})
+        throttle.update(step="Generating Combined Report...", progress=90)
+        throttle.flush()
         
-        violations = sum(1 for i in all_issues if i.get('severity') == 'violation')
-        warnings = sum(1 for i in all_issues if i.get('severity') == 'warning')
-        notices = sum(1 for i in all_issues if i.get('severity') == 'notice')
+        severity_counts = Counter(i.get('severity', '') for i in all_issues)
+        violations = severity_counts['violation']
+        warnings = severity_counts['warning']
+        notices = severity_counts['notice']
 
         # Generate PDF report (needs update to handle page_url per issue)
-        from utils.accessibility_report import generate_accessibility_pdf
         report_path = generate_accessibility_pdf(all_issues, sitemap_url, wcag_level, job_id, job_dir)
         
         final_result = {
@@ -948,17 +1209,16 @@ def process_accessibility_sitemap(job_id, sitemap_url, wcag_level, job_dir):
         })
         
     except Exception as e:
-        import traceback
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {"status": "failed", "error": error_details})
 
 
 
 @app.get("/api/accessibility/history")
 def get_accessibility_history():
-    jobs = store.list_jobs()
     # Include sitemap jobs
-    accessibility_jobs = [j for j in jobs if j.get("type") in ["accessibility", "accessibility_sitemap"]]
+    job_types = ["accessibility", "accessibility_sitemap"]
     
     # Pagination
     try:
@@ -972,13 +1232,13 @@ def get_accessibility_history():
     if limit < 1: limit = 10
 
     start = (page - 1) * limit
-    end = start + limit
     
-    paginated_jobs = accessibility_jobs[start:end]
+    # Filtering and slicing happen inside the store
+    paginated_jobs = store.list_jobs(job_type=job_types, offset=start, limit=limit)
     
     return jsonify({
         "jobs": paginated_jobs,
-        "total": len(accessibility_jobs),
+        "total": store.count_jobs(job_type=job_types),
         "page": page,
         "limit": limit
     })
@@ -992,14 +1252,7 @@ def delete_accessibility_history():
     if not job_ids:
         return jsonify({"error": "No job IDs provided"}), 400
     
-    for job_id in job_ids:
-        store.delete_job(job_id)
-        job_dir = os.path.join(RUNS_DIR, job_id)
-        if os.path.exists(job_dir):
-            import shutil
-            shutil.rmtree(job_dir)
-    
-    return jsonify({"message": f"Deleted {len(job_ids)} job(s)"}), 200
+    return _delete_jobs(job_ids)
 
 
 @app.get("/seo-performance")
@@ -1017,6 +1270,7 @@ def run_seo_performance_test():
         test_type = data.get("test_type", "both")
         device_type = data.get("device_type", "desktop")
         api_key = data.get("api_key", "").strip() or None
+        no_cache = bool(data.get("no_cache"))
         file = None
     else:
         # FormData
@@ -1024,7 +1278,7 @@ def run_seo_performance_test():
         test_type = request.form.get("test_type", "both")
         device_type = request.form.get("device_type", "desktop")
         api_key = request.form.get("api_key", "").strip() or None
-        api_key = request.form.get("api_key", "").strip() or None
+        no_cache = request.form.get("no_cache", "").lower() in ("1", "true", "on")
         file = request.files.get("file")
         sitemap_url = request.form.get("sitemap_url")
 
@@ -1035,7 +1289,9 @@ def run_seo_performance_test():
     if file:
         filename = secure_filename(file.filename)
         file_path = os.path.join(job_dir, filename)
-        file.save(file_path)
+        # Stream the upload to disk in 1 MiB chunks
+        with open(file_path, "wb") as out:
+            shutil.copyfileobj(file.stream, out, length=1 << 20)
         
         job_data = {
             "job_id": job_id,
@@ -1046,14 +1302,13 @@ def run_seo_performance_test():
             "status": "running",
             "progress": 0,
             "step": "Starting batch analysis...",
+            "no_cache": no_cache,
             "timestamp": datetime.datetime.utcnow().isoformat(),
             "result": None
         }
         store.save_job(job_id, job_data)
         
-        thread = threading.Thread(target=process_seo_performance_batch, 
-                                 args=(job_id, file_path, test_type, device_type, job_dir, api_key))
-        thread.start()
+        JOB_POOL.submit(process_seo_performance_batch, job_id, file_path, test_type, device_type, job_dir, api_key, use_cache=not no_cache)
         
     elif sitemap_url:
         job_data = {
@@ -1066,14 +1321,13 @@ def run_seo_performance_test():
             "status": "running",
             "progress": 0,
             "step": "Fetching sitemap URLs...",
+            "no_cache": no_cache,
             "timestamp": datetime.datetime.utcnow().isoformat(),
             "result": None
         }
         store.save_job(job_id, job_data)
         
-        thread = threading.Thread(target=process_seo_performance_sitemap, 
-                                 args=(job_id, sitemap_url, test_type, device_type, job_dir, api_key))
-        thread.start()
+        JOB_POOL.submit(process_seo_performance_sitemap, job_id, sitemap_url, test_type, device_type, job_dir, api_key, use_cache=not no_cache)
 
     elif page_url:
         job_data = {
@@ -1090,9 +1344,7 @@ def run_seo_performance_test():
         }
         store.save_job(job_id, job_data)
         
-        thread = threading.Thread(target=process_seo_performance_test, 
-                                 args=(job_id, page_url, test_type, device_type, job_dir, api_key))
-        thread.start()
+        JOB_POOL.submit(process_seo_performance_test, job_id, page_url, test_type, device_type, job_dir, api_key)
     else:
          return jsonify({"error": "Page URL, Sitemap URL, or File upload is required"}), 400
 
@@ -1103,7 +1355,6 @@ PAGESPEED_API_KEY = os.environ.get("PAGESPEED_API_KEY", "AIzaSyCETduV3lTJKEGn_JT
 
 def process_seo_performance_test(job_id, page_url, test_type, device_type, job_dir, api_key=None):
     try:
-        from utils.pagespeed import PageSpeedInsights
         
         store.save_job(job_id, {"step": "Connecting to PageSpeed Insights...", "progress": 10})
         
@@ -1164,7 +1415,6 @@ def process_seo_performance_test(job_id, page_url, test_type, device_type, job_d
         store.save_job(job_id, {"step": "Generating PDF report...", "progress": 85})
         
         # Generate PDF report
-        from utils.seo_performance_report import generate_seo_performance_pdf
         report_path = generate_seo_performance_pdf(metrics, page_url, test_type, device_type, job_id, job_dir)
         
         final_result = {
@@ -1188,208 +1438,262 @@ def process_seo_performance_test(job_id, page_url, test_type, device_type, job_d
         })
         
     except Exception as e:
-        import traceback
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {"status": "failed", "error": error_details})
 
 
-def process_seo_performance_batch(job_id, file_path, test_type, device_type, job_dir, api_key=None):
-    import pandas as pd
-    from utils.pagespeed import PageSpeedInsights
-    import traceback
+_URL_HTTP_RE = re.compile(r'^https?://', re.I)
 
-    try:
-        store.save_job(job_id, {"step": "Reading file...", "progress": 5})
-        
-        # Read Excel or CSV
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
-            
-        # Find URL column
-        url_col = None
-        for col in df.columns:
-            if "url" in str(col).lower() or "link" in str(col).lower() or "website" in str(col).lower():
-                url_col = col
-                break
-        if not url_col:
-            # Fallback: assume first column
-            url_col = df.columns[0]
-            
-        urls = df[url_col].dropna().tolist()
-        total_urls = len(urls)
-        
-        if total_urls == 0:
-            raise Exception("No URLs found in the file.")
-            
-        store.save_job(job_id, {"step": f"Found {total_urls} URLs to process...", "progress": 10})
-        
-        key_to_use = api_key or PAGESPEED_API_KEY
-        psi = PageSpeedInsights(api_key=key_to_use)
-        
-        # Determine categories
-        categories = []
-        if test_type == 'seo':
-            categories = ['seo']
-        elif test_type == 'performance':
-            categories = ['performance']
-        else:
-            categories = ['performance', 'seo', 'accessibility', 'best-practices']
-            
-        if device_type == 'both':
-            strategy = 'both'
-        else:
-            strategy = 'mobile' if device_type == 'mobile' else 'desktop'
-        results = []
-        
-        for i, url in enumerate(urls):
-            current_progress = 10 + int(((i) / total_urls) * 80)
-            store.save_job(job_id, {"step": f"Analyzing {i+1}/{total_urls}: {url}", "progress": current_progress})
-            
-            try:
-                # Basic validation
-                if not url.startswith('http'):
-                    # Try to prepend https if missing, or skip
-                    if not url.startswith('www'):
-                         results.append({
-                            "URL": url,
-                            "Status": "Skipped (Invalid URL)",
-                            "Error": "URL must start with http/https"
-                        })
-                         continue
-                    else:
-                        url = "https://" + url
-                    
-                metrics = psi.analyze(url, strategy=strategy, categories=categories)
-                
-                row = {
-                    "URL": url,
-                    "Status": "Success",
-                    "SEO Score": metrics.get('seo_score', 'N/A'),
-                    "Performance Score": metrics.get('performance_score', 'N/A'),
-                    "Load Time (s)": metrics.get('load_time', 'N/A'),
-                    "First Contentful Paint": next((audit['displayValue'] for audit in metrics.get('performance_details', []) if audit['id'] == 'first-contentful-paint'), 'N/A'),
-                    "Largest Contentful Paint": next((audit['displayValue'] for audit in metrics.get('performance_details', []) if audit['id'] == 'largest-contentful-paint'), 'N/A'),
-                    "Cumulative Layout Shift": next((audit['displayValue'] for audit in metrics.get('performance_details', []) if audit['id'] == 'cumulative-layout-shift'), 'N/A'),
-                    "Time to First Byte": next((audit['displayValue'] for audit in metrics.get('performance_details', []) if audit['id'] == 'server-response-time'), 'N/A'),
-                    "First Input Delay": next((audit['displayValue'] for audit in metrics.get('performance_details', []) if audit['id'] == 'first-input-delay'), 'N/A'),
-                }
-                results.append(row)
-                
-            except Exception as e:
-                print(f"Error processing {url}: {e}")
-                results.append({
-                    "URL": url,
-                    "Status": "Failed",
-                    "Error": str(e)
-                })
-                
-        store.save_job(job_id, {"step": "Generating consolidated report...", "progress": 95})
-        
-        # Create Excel Report
-        report_df = pd.DataFrame(results)
-        report_filename = f"seo_performance_report_{job_id}.xlsx"
-        report_path = os.path.join(job_dir, report_filename)
-        report_df.to_excel(report_path, index=False)
-        
-        final_result = {
-            "total_processed": total_urls,
-            "report_url": f"/download/{job_id}/{report_filename}"
-        }
-        
-        store.save_job(job_id, {
-            "result": final_result,
-            "status": "completed",
-            "progress": 100,
-            "step": "Done"
-        })
 
-    except Exception as e:
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
-        store.save_job(job_id, {"status": "failed", "error": error_details})
+def _split_psi_urls(urls):
+    """
+    Normalise a whole URL list at once: 'www.' values get https://, anything
+    else without an http(s):// scheme can't be analyzed. Returns (pending, skipped):
+    unique analyzable URLs and unique invalid values, both in input order.
+    """
+    s = pd.Series(list(urls), dtype=object).dropna().astype(str).str.strip()
+    s = s[s != ""].drop_duplicates()
+    is_http = s.str.match(_URL_HTTP_RE)
+    is_www = ~is_http & s.str.lower().str.startswith("www.")
+    skipped = s[~(is_http | is_www)].tolist()
+    pending = s.where(is_http, "https://" + s)[is_http | is_www].drop_duplicates().tolist()
+    return pending, skipped
+
+
+def _skipped_psi_row(url):
+    return {
+        "URL": url,
+        "Status": "Skipped (Invalid URL)",
+        "Error": "URL must start with http/https"
+    }
 
-def analyze_single_url_psi(url, psi, strategy, categories):
-    try:
-        if not url.startswith('http'):
-            if not url.startswith('www'):
-                 return {
-                    "URL": url,
-                    "Status": "Skipped (Invalid URL)",
-                    "Error": "URL must start with http/https"
-                }
-            else:
-                url = "https://" + url
-            
-        if strategy == 'both':
-            metrics_d = psi.analyze(url, strategy='desktop', categories=categories)
-            metrics_m = psi.analyze(url, strategy='mobile', categories=categories)
-            
-            return {
-                "URL": url,
-                "Status": "Success",
-                "Perf (Desktop)": metrics_d.get('performance_score', 'N/A'),
-                "Perf (Mobile)": metrics_m.get('performance_score', 'N/A'),
-                "Performance Score": metrics_m.get('performance_score', 'N/A'), # Baseline for summary
-                "SEO Score": metrics_m.get('seo_score', 'N/A'),
-                "Accessibility Score": metrics_m.get('accessibility_score', 'N/A'),
-                "Best Practices Score": metrics_m.get('best_practices_score', 'N/A'),
-                "Load Time (s)": metrics_m.get('load_time', 'N/A'),
-                "LCP (Mobile)": next((d['displayValue'] for d in metrics_m.get('performance_details', []) if d.get('id') == 'largest-contentful-paint'), 'N/A'),
-                "LCP (Desktop)": next((d['displayValue'] for d in metrics_d.get('performance_details', []) if d.get('id') == 'largest-contentful-paint'), 'N/A'),
-                "Largest Contentful Paint": next((d['displayValue'] for d in metrics_m.get('performance_details', []) if d.get('id') == 'largest-contentful-paint'), 'N/A'),
-                "Cumulative Layout Shift": next((d['displayValue'] for d in metrics_m.get('performance_details', []) if d.get('id') == 'cumulative-layout-shift'), 'N/A'),
-                "Time to First Byte": next((d['displayValue'] for d in metrics_m.get('performance_details', []) if d.get('id') == 'server-response-time'), 'N/A'),
-            }
-        
-        metrics = psi.analyze(url, strategy=strategy, categories=categories)
-        
+
+def _details_by_id(metrics):
+    """Index a metrics dict's performance_details by audit id -> displayValue."""
+    return {d.get('id'): d.get('displayValue') for d in metrics.get('performance_details', [])}
+
+
+def _build_psi_row(url, strategy, metrics):
+    """Build one batch-report row. For 'both', metrics is a (desktop, mobile) tuple."""
+    if strategy == 'both':
+        metrics_d, metrics_m = metrics
+        pd_map_d = _details_by_id(metrics_d)
+        pd_map_m = _details_by_id(metrics_m)
         return {
             "URL": url,
             "Status": "Success",
-            "Performance Score": metrics.get('performance_score', 'N/A'),
-            "Accessibility Score": metrics.get('accessibility_score', 'N/A'),
-            "Best Practices Score": metrics.get('best_practices_score', 'N/A'),
-            "Load Time (s)": metrics.get('load_time', 'N/A'),
-            "First Contentful Paint": next((d['displayValue'] for d in metrics.get('performance_details', []) if d.get('id') == 'first-contentful-paint'), 'N/A'),
-            "Largest Contentful Paint": next((d['displayValue'] for d in metrics.get('performance_details', []) if d.get('id') == 'largest-contentful-paint'), 'N/A'),
-            "Cumulative Layout Shift": next((d['displayValue'] for d in metrics.get('performance_details', []) if d.get('id') == 'cumulative-layout-shift'), 'N/A'),
-            "Time to First Byte": next((d['displayValue'] for d in metrics.get('performance_details', []) if d.get('id') == 'server-response-time'), 'N/A'),
-            "First Input Delay": next((d['displayValue'] for d in metrics.get('performance_details', []) if d.get('id') == 'first-input-delay'), 'N/A'),
-        }
-    except Exception as e:
-        return {
-            "URL": url,
-            "Status": "Failed",
-            "Error": str(e)
+            "Perf (Desktop)": metrics_d.get('performance_score', 'N/A'),
+            "Perf (Mobile)": metrics_m.get('performance_score', 'N/A'),
+            "Performance Score": metrics_m.get('performance_score', 'N/A'), # Baseline for summary
+            "SEO Score": metrics_m.get('seo_score', 'N/A'),
+            "Accessibility Score": metrics_m.get('accessibility_score', 'N/A'),
+            "Best Practices Score": metrics_m.get('best_practices_score', 'N/A'),
+            "Load Time (s)": metrics_m.get('load_time', 'N/A'),
+            "LCP (Mobile)": pd_map_m.get('largest-contentful-paint', 'N/A'),
+            "LCP (Desktop)": pd_map_d.get('largest-contentful-paint', 'N/A'),
+            "Largest Contentful Paint": pd_map_m.get('largest-contentful-paint', 'N/A'),
+            "Cumulative Layout Shift": pd_map_m.get('cumulative-layout-shift', 'N/A'),
+            "Time to First Byte": pd_map_m.get('server-response-time', 'N/A'),
         }
 
-def process_seo_performance_batch(job_id, file_path, test_type, device_type, job_dir, api_key=None):
-    import pandas as pd
-    from utils.pagespeed import PageSpeedInsights
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    import traceback
+    pd_map = _details_by_id(metrics)
+    return {
+        "URL": url,
+        "Status": "Success",
+        "Performance Score": metrics.get('performance_score', 'N/A'),
+        "Accessibility Score": metrics.get('accessibility_score', 'N/A'),
+        "Best Practices Score": metrics.get('best_practices_score', 'N/A'),
+        "Load Time (s)": metrics.get('load_time', 'N/A'),
+        "First Contentful Paint": pd_map.get('first-contentful-paint', 'N/A'),
+        "Largest Contentful Paint": pd_map.get('largest-contentful-paint', 'N/A'),
+        "Cumulative Layout Shift": pd_map.get('cumulative-layout-shift', 'N/A'),
+        "Time to First Byte": pd_map.get('server-response-time', 'N/A'),
+        "First Input Delay": pd_map.get('first-input-delay', 'N/A'),
+    }
+
+
+def _cached_psi_metrics(url, strategy, categories):
+    """Cached metrics for url, or None. For 'both' both halves must be cached."""
+    if strategy == 'both':
+        metrics_d = psi_cache.get(url, 'desktop', categories)
+        metrics_m = psi_cache.get(url, 'mobile', categories)
+        return (metrics_d, metrics_m) if metrics_d and metrics_m else None
+    return psi_cache.get(url, strategy, categories)
+
+
+def _cache_psi_metrics(url, strategy, categories, metrics):
+    if strategy == 'both':
+        psi_cache.set(url, 'desktop', categories, metrics[0])
+        psi_cache.set(url, 'mobile', categories, metrics[1])
+    else:
+        psi_cache.set(url, strategy, categories, metrics)
+
 
+def _stream_psi_urls(urls, on_skipped, counts):
+    """
+    Lazy, per-URL counterpart of _split_psi_urls for URL streams (e.g. a
+    sitemap still being fetched). Yields unique analyzable URLs, reports
+    invalid ones through on_skipped, and keeps counts["total"] at the number
+    of report rows seen so far; counts["done"] is set once the stream is
+    exhausted and the count is final.
+    """
+    seen = set()
+    rows = 0
+    for url in urls:
+        url = str(url).strip() if url is not None else ""
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        if _URL_HTTP_RE.match(url):
+            target = url
+        elif url.lower().startswith("www."):
+            target = "https://" + url
+        else:
+            rows += 1
+            counts["total"] = rows
+            on_skipped(url)
+            continue
+        if target != url:
+            if target in seen:
+                continue
+            seen.add(target)
+        rows += 1
+        counts["total"] = rows
+        yield target
+    counts["done"] = True
+
+
+def _run_psi_analyses(job_id, urls, psi, strategy, categories, use_cache=True):
+    """
+    Run PageSpeed Insights for every URL, saving progress as each one finishes.
+    Uses the async client when aiohttp is available, else the shared PSI_POOL.
+    Results from the last few hours are reused unless use_cache is False.
+
+    `urls` may be a list or a lazy iterator. With an iterator, analyses start
+    as URLs arrive and progress is measured against the URLs seen so far,
+    held at half way until the stream ends so it never has to move backwards.
+    Returns one report row per URL.
+    """
+    results = []
+    throttle = ProgressThrottle(job_id)
+
+    def record(url, row):
+        results.append(row)
+        completed = len(results)
+        total_urls = max(counts["total"], completed)
+        fraction = completed / total_urls if counts["done"] else min(completed / total_urls, 0.5)
+        counts["progress"] = max(counts["progress"], 10 + int(fraction * 85))
+        throttle.update(step=f"Analyzed {completed}/{total_urls}: {url}", progress=counts["progress"])
+
+    def record_skipped(url):
+        record(url, _skipped_psi_row(url))
+
+    # Each PSI call costs seconds and API quota: analyze every URL once and
+    # settle the invalid ones up front instead of dispatching them.
+    if isinstance(urls, list):
+        pending, skipped = _split_psi_urls(urls)
+        counts = {"total": len(pending) + len(skipped), "done": True, "progress": 0}
+        for url in skipped:
+            record_skipped(url)
+    else:
+        counts = {"total": 0, "done": False, "progress": 0}
+        pending = _stream_psi_urls(urls, record_skipped, counts)
+
+    if use_cache:
+        def uncached(targets):
+            for url in targets:
+                metrics = _cached_psi_metrics(url, strategy, categories)
+                if metrics is None:
+                    yield url
+                else:
+                    record(url, _build_psi_row(url, strategy, metrics))
+        pending = uncached(pending)
+
+    if analyze_urls_async is not None:
+        def on_result(url, metrics, error):
+            if error is not None:
+                record(url, {"URL": url, "Status": "Failed", "Error": str(error)})
+            else:
+                _cache_psi_metrics(url, strategy, categories, metrics)
+                record(url, _build_psi_row(url, strategy, metrics))
+
+        analyze_urls_async(pending, strategy, categories, api_key=psi.api_key,
+                           concurrency=PSI_WORKERS, on_result=on_result)
+        throttle.flush()
+        return results
+
+    # Process in parallel on the shared PSI pool (bounded to respect API rate limits).
+    # For 'both', desktop and mobile are separate tasks so they run concurrently;
+    # a URL's row is built once both halves are in.
+    # URLs are submitted as they arrive, so with a stream the pool is already
+    # busy while the rest of the sitemap is still being fetched.
+    halves = ('desktop', 'mobile') if strategy == 'both' else (strategy,)
+    future_to_key = {
+        PSI_POOL.submit(psi.analyze, url, strategy=half, categories=categories): (url, half)
+        for url in pending for half in halves
+    }
+    finished = {}
+
+    for future in as_completed(future_to_key):
+        url, half = future_to_key[future]
+        try:
+            finished.setdefault(url, {})[half] = future.result()
+        except Exception as e:
+            finished.setdefault(url, {})[half] = e
+        if len(finished[url]) < len(halves):
+            continue
+
+        outcome = finished.pop(url)
+        error = next((outcome[h] for h in halves if isinstance(outcome[h], Exception)), None)
+        if error is not None:
+            record(url, {"URL": url, "Status": "Failed", "Error": str(error)})
+            continue
+        metrics = tuple(outcome[h] for h in halves) if strategy == 'both' else outcome[strategy]
+        _cache_psi_metrics(url, strategy, categories, metrics)
+        record(url, _build_psi_row(url, strategy, metrics))
+
+    throttle.flush()
+    return results
+
+def _pick_url_column(columns):
+    # First column whose header mentions url/link/website, else the first column
+    mask = pd.Index(columns).astype(str).str.lower().str.contains(r"url|link|website", regex=True)
+    return columns[mask.argmax()] if mask.any() else columns[0]
+
+
+def _read_url_column(file_path):
+    """
+    Read the URL column of an uploaded CSV/Excel file without loading the
+    whole sheet: CSV is read in chunks of just that column, xlsx row by row.
+    """
+    urls = []
+    if file_path.endswith('.csv'):
+        url_col = _pick_url_column(list(pd.read_csv(file_path, nrows=0).columns))
+        for chunk in pd.read_csv(file_path, usecols=[url_col], chunksize=10_000):
+            urls.extend(chunk[url_col].dropna().tolist())
+    elif file_path.endswith('.xlsx'):
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = wb.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header:
+                col_idx = list(header).index(_pick_url_column(list(header)))
+                urls = [row[col_idx] for row in rows
+                        if len(row) > col_idx and row[col_idx] is not None]
+        finally:
+            wb.close()
+    else:
+        df = pd.read_excel(file_path)
+        urls = df[_pick_url_column(list(df.columns))].dropna().tolist()
+    return urls
+
+
+def process_seo_performance_batch(job_id, file_path, test_type, device_type, job_dir, api_key=None, use_cache=True):
     try:
         store.save_job(job_id, {"step": "Reading file...", "progress": 5})
         
-        # Read Excel or CSV
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        else:
-            df = pd.read_excel(file_path)
-            
-        # Find URL column
-        url_col = None
-        for col in df.columns:
-            if "url" in str(col).lower() or "link" in str(col).lower() or "website" in str(col).lower():
-                url_col = col
-                break
-        if not url_col:
-            # Fallback: assume first column
-            url_col = df.columns[0]
-            
-        urls = df[url_col].dropna().tolist()
+        urls = _read_url_column(file_path)
         total_urls = len(urls)
         
         if total_urls == 0:
@@ -1413,41 +1717,16 @@ def process_seo_performance_batch(job_id, file_path, test_type, device_type, job
             strategy = 'both'
         else:
             strategy = 'mobile' if device_type == 'mobile' else 'desktop'
-        results = []
-        completed = 0
-        
-        # Process in parallel (max 3 workers to avoid strict rate limits if no API key)
-        with ThreadPoolExecutor(max_workers=3) as executor:
-            future_to_url = {executor.submit(analyze_single_url_psi, url, psi, strategy, categories): url for url in urls}
-            
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    res = future.result()
-                    results.append(res)
-                except Exception as e:
-                    results.append({"URL": url, "Status": "System Error", "Error": str(e)})
-                
-                completed += 1
-                current_progress = 10 + int((completed / total_urls) * 85)
-                store.save_job(job_id, {"step": f"Analyzed {completed}/{total_urls}: {url}", "progress": current_progress})
+        results = _run_psi_analyses(job_id, urls, psi, strategy, categories, use_cache=use_cache)
 
         store.save_job(job_id, {"step": "Generating consolidated report...", "progress": 98})
         
-        # Create Excel Report
-        # Create Excel Report
-        report_df = pd.DataFrame(results)
-        report_filename = f"seo_performance_report_{job_id}.xlsx"
-        report_path = os.path.join(job_dir, report_filename)
-        report_df.to_excel(report_path, index=False)
-        
-        # Create PDF Report
-        from utils.seo_performance_report import generate_batch_seo_pdf
-        pdf_path = generate_batch_seo_pdf(results, job_id, job_dir, test_type=test_type)
+        # Excel + PDF reports in one pass over the results
+        report_path, pdf_path = write_batch_reports(results, job_dir, job_id, test_type=test_type)
 
         final_result = {
-            "total_processed": total_urls,
-            "report_url": f"/download/{job_id}/{report_filename}",
+            "total_processed": len(results),
+            "report_url": f"/download/{job_id}/{os.path.basename(report_path)}",
             "pdf_report_url": f"/download/{job_id}/{os.path.basename(pdf_path)}"
         }
         
@@ -1459,30 +1738,15 @@ def process_seo_performance_batch(job_id, file_path, test_type, device_type, job
         })
 
     except Exception as e:
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {"status": "failed", "error": error_details})
 
 
-def process_seo_performance_sitemap(job_id, sitemap_url, test_type, device_type, job_dir, api_key=None):
-    from utils.sitemap_parser import fetch_sitemap_urls
-    from utils.pagespeed import PageSpeedInsights
-    import pandas as pd
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-    import traceback
-
+def process_seo_performance_sitemap(job_id, sitemap_url, test_type, device_type, job_dir, api_key=None, use_cache=True):
     try:
         store.save_job(job_id, {"step": "Fetching sitemap URLs...", "progress": 5})
         
-        urls = list(fetch_sitemap_urls(sitemap_url))
-        if not urls:
-            raise Exception("No URLs found in sitemap")
-            
-        # Limit processed pages
-        urls = urls[:200]
-        total_urls = len(urls)
-        
-        store.save_job(job_id, {"step": f"Found {total_urls} URLs to process...", "progress": 10})
-        
         key_to_use = api_key or PAGESPEED_API_KEY
         psi = PageSpeedInsights(api_key=key_to_use)
         
@@ -1499,40 +1763,24 @@ def process_seo_performance_sitemap(job_id, sitemap_url, test_type, device_type,
             strategy = 'both'
         else:
             strategy = 'mobile' if device_type == 'mobile' else 'desktop'
-        results = []
-        completed = 0
-        
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            future_to_url = {executor.submit(analyze_single_url_psi, url, psi, strategy, categories): url for url in urls}
-            
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    res = future.result()
-                    results.append(res)
-                except Exception as e:
-                    results.append({"URL": url, "Status": "System Error", "Error": str(e)})
-                    
-                completed += 1
-                current_progress = 10 + int((completed / total_urls) * 85)
-                store.save_job(job_id, {"step": f"Analyzed {completed}/{total_urls}: {url}", "progress": current_progress})
+
+        # Limit processed pages. URLs are analyzed as the sitemap (and any
+        # nested sitemaps) streams in rather than after the whole fetch.
+        max_urls = 200
+        urls = islice(fetch_sitemap_urls(sitemap_url), max_urls)
+        results = _run_psi_analyses(job_id, urls, psi, strategy, categories,
+                                    use_cache=use_cache)
+        if not results:
+            raise Exception("No URLs found in sitemap")
 
         store.save_job(job_id, {"step": "Generating consolidated report...", "progress": 98})
         
-        # Create Excel Report
-        # Create Excel Report
-        report_df = pd.DataFrame(results)
-        report_filename = f"seo_performance_report_{job_id}.xlsx"
-        report_path = os.path.join(job_dir, report_filename)
-        report_df.to_excel(report_path, index=False)
-        
-        # Create PDF Report
-        from utils.seo_performance_report import generate_batch_seo_pdf
-        pdf_path = generate_batch_seo_pdf(results, job_id, job_dir, test_type=test_type)
+        # Excel + PDF reports in one pass over the results
+        report_path, pdf_path = write_batch_reports(results, job_dir, job_id, test_type=test_type)
 
         final_result = {
-            "total_processed": total_urls,
-            "report_url": f"/download/{job_id}/{report_filename}",
+            "total_processed": len(results),
+            "report_url": f"/download/{job_id}/{os.path.basename(report_path)}",
             "pdf_report_url": f"/download/{job_id}/{os.path.basename(pdf_path)}"
         }
         
@@ -1544,14 +1792,14 @@ def process_seo_performance_sitemap(job_id, sitemap_url, test_type, device_type,
         })
 
     except Exception as e:
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {"status": "failed", "error": error_details})
 
 
 @app.get("/api/seo-performance/history")
 def get_seo_performance_history():
-    jobs = store.list_jobs()
-    seo_perf_jobs = [j for j in jobs if j.get("type") == "seo_performance"]
+    job_type = "seo_performance"
     
     # Pagination
     try:
@@ -1565,13 +1813,13 @@ def get_seo_performance_history():
     if limit < 1: limit = 10
 
     start = (page - 1) * limit
-    end = start + limit
     
-    paginated_jobs = seo_perf_jobs[start:end]
+    # Filtering and slicing happen inside the store
+    paginated_jobs = store.list_jobs(job_type=job_type, offset=start, limit=limit)
     
     return jsonify({
         "jobs": paginated_jobs,
-        "total": len(seo_perf_jobs),
+        "total": store.count_jobs(job_type=job_type),
         "page": page,
         "limit": limit
     })
@@ -1585,14 +1833,7 @@ def delete_seo_performance_history():
     if not job_ids:
         return jsonify({"error": "No job IDs provided"}), 400
     
-    for job_id in job_ids:
-        store.delete_job(job_id)
-        job_dir = os.path.join(RUNS_DIR, job_id)
-        if os.path.exists(job_dir):
-            import shutil
-            shutil.rmtree(job_dir)
-    
-    return jsonify({"message": f"Deleted {len(job_ids)} job(s)"}), 200
+    return _delete_jobs(job_ids)
 
 
 
@@ -1635,44 +1876,48 @@ def run_semantic_validation():
     store.save_job(job_id, job_data)
 
     if input_type == "sitemap":
-        thread = threading.Thread(
-            target=process_semantic_sitemap,
-            args=(job_id, sitemap_url, job_dir)
-        )
+        JOB_POOL.submit(process_semantic_sitemap, job_id, sitemap_url, job_dir)
     else:
-        thread = threading.Thread(
-            target=process_semantic_validation,
-            args=(job_id, page_url, job_dir)
-        )
-    thread.start()
+        JOB_POOL.submit(process_semantic_validation, job_id, page_url, job_dir)
 
     return jsonify({"job_id": job_id})
 
 
+SEMANTIC_COUNTER_DTYPE = np.dtype([
+    ("total_issues", "i8"), ("critical", "i8"), ("warnings", "i8"), ("info", "i8"),
+    ("score", "f8"), ("success", "?")
+])
+
+
+def _tagged_issues(pages, cap=200):
+    """
+    Collect up to `cap` issues across pages, each message prefixed with its
+    (truncated) page URL, plus the summed category counts of every page.
+    """
+    tagged = []
+    cat_counts = Counter()
+    for p in pages:
+        cat_counts.update(p.get("category_counts", {}))
+        if len(tagged) >= cap:
+            continue
+        short_url = p.get("url", "")
+        if len(short_url) > 50:
+            short_url = short_url[:50] + "..."
+        prefix = f"[{short_url}] "
+        for issue in islice(p.get("issues", ()), cap - len(tagged)):
+            tagged_issue = issue.copy()
+            tagged_issue["message"] = prefix + issue.get("message", "")
+            tagged.append(tagged_issue)
+    return tagged, cat_counts
+
+
 def process_semantic_sitemap(job_id, sitemap_url, job_dir):
-    import traceback
     try:
         store.save_job(job_id, {"step": "Fetching sitemap...", "progress": 5})
 
-        # Fetch and parse sitemap
-        import requests as req
-        from bs4 import BeautifulSoup
-        resp = req.get(sitemap_url, timeout=30, headers={"User-Agent": "QA-Testing-Framework/1.0"})
-        resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "lxml-xml")
-
-        urls = [loc.text.strip() for loc in soup.find_all("loc") if loc.text.strip()]
-        if not urls:
-            # Try as sitemap index
-            sitemaps = [s.text.strip() for s in soup.find_all("sitemap")]
-            if sitemaps:
-                for sm_url in sitemaps[:5]:
-                    try:
-                        sm_resp = req.get(sm_url, timeout=30, headers={"User-Agent": "QA-Testing-Framework/1.0"})
-                        sm_soup = BeautifulSoup(sm_resp.text, "lxml-xml")
-                        urls.extend([loc.text.strip() for loc in sm_soup.find_all("loc")])
-                    except Exception:
-                        pass
+        # Stream the sitemap (or up to 5 child sitemaps of an index, fetched in
+        # parallel) and stop reading once we have the 50 pages we'll validate
+        urls = list(islice(iter_sitemap_urls(sitemap_url, child_limit=50), 50))
 
         if not urls:
             store.save_job(job_id, {
@@ -1683,12 +1928,9 @@ def process_semantic_sitemap(job_id, sitemap_url, job_dir):
             })
             return
 
-        # Cap at 50 pages to avoid excessive validation time
-        urls = urls[:50]
         total = len(urls)
         store.save_job(job_id, {"step": f"Found {total} URLs. Starting validation...", "progress": 10})
 
-        from utils.semantic_validator import validate_html_semantics
 
         pages = []
         for idx, url in enumerate(urls):
@@ -1717,25 +1959,30 @@ def process_semantic_sitemap(job_id, sitemap_url, job_dir):
         # Aggregate results
         store.save_job(job_id, {"step": "Generating aggregate report...", "progress": 85})
 
-        scores = [p.get("score", 0) for p in pages if p.get("success")]
-        avg_score = round(sum(scores) / len(scores)) if scores else 0
+        # Per-page counters and scores in one pass, as a record array reduced column-wise
+        counters = np.fromiter(
+            ((p.get("total_issues", 0), p.get("critical", 0), p.get("warnings", 0), p.get("info", 0),
+              p.get("score", 0), bool(p.get("success"))) for p in pages),
+            dtype=SEMANTIC_COUNTER_DTYPE, count=len(pages)
+        )
+        succeeded = int(counters["success"].sum())
+        avg_score = round(float(counters["score"][counters["success"]].sum()) / succeeded) if succeeded else 0
 
         batch_result = {
             "batch": True,
             "sitemap_url": sitemap_url,
             "total_pages": total,
             "average_score": avg_score,
-            "total_issues": sum(p.get("total_issues", 0) for p in pages),
-            "total_critical": sum(p.get("critical", 0) for p in pages),
-            "total_warnings": sum(p.get("warnings", 0) for p in pages),
-            "total_info": sum(p.get("info", 0) for p in pages),
+            "total_issues": int(counters["total_issues"].sum()),
+            "total_critical": int(counters["critical"].sum()),
+            "total_warnings": int(counters["warnings"].sum()),
+            "total_info": int(counters["info"].sum()),
             "pages": pages
         }
 
         # Generate PDF report for the batch
         store.save_job(job_id, {"step": "Generating PDF report...", "progress": 90})
         try:
-            from utils.semantic_report import generate_semantic_report
             # Create a summary result for the PDF
             summary_for_pdf = {
                 "url": f"Sitemap: {sitemap_url}",
@@ -1751,22 +1998,8 @@ def process_semantic_sitemap(job_id, sitemap_url, job_dir):
                 "issues": [],
                 "success": True
             }
-            # Aggregate category counts and issues from all pages
-            all_issues = []
-            cat_counts = {}
-            for p in pages:
-                for issue in p.get("issues", []):
-                    tagged_issue = dict(issue)
-                    short_url = p.get("url", "")
-                    if len(short_url) > 50:
-                        short_url = short_url[:50] + "..."
-                    tagged_issue["message"] = f"[{short_url}] {issue.get('message', '')}"
-                    all_issues.append(tagged_issue)
-                for cat, count in p.get("category_counts", {}).items():
-                    cat_counts[cat] = cat_counts.get(cat, 0) + count
-
-            summary_for_pdf["issues"] = all_issues[:200]  # Cap for PDF size
-            summary_for_pdf["category_counts"] = cat_counts
+            # Aggregate category counts and issues from all pages (issues capped for PDF size)
+            summary_for_pdf["issues"], summary_for_pdf["category_counts"] = _tagged_issues(pages)
 
             pdf_path = generate_semantic_report(summary_for_pdf, job_id, job_dir)
             batch_result["pdf_report_url"] = f"/download/{job_id}/{os.path.basename(pdf_path)}"
@@ -1781,7 +2014,8 @@ def process_semantic_sitemap(job_id, sitemap_url, job_dir):
         })
 
     except Exception as e:
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {
             "status": "failed",
             "error": error_details,
@@ -1791,11 +2025,9 @@ def process_semantic_sitemap(job_id, sitemap_url, job_dir):
 
 
 def process_semantic_validation(job_id, page_url, job_dir):
-    import traceback
     try:
         store.save_job(job_id, {"step": "Fetching and parsing HTML...", "progress": 10})
 
-        from utils.semantic_validator import validate_html_semantics
         store.save_job(job_id, {"step": "Running semantic checks...", "progress": 30})
 
         result = validate_html_semantics(page_url)
@@ -1809,22 +2041,19 @@ def process_semantic_validation(job_id, page_url, job_dir):
             })
             return
 
-        store.save_job(job_id, {"step": "Generating PDF report...", "progress": 75})
-
-        # Generate PDF report
-        from utils.semantic_report import generate_semantic_report
-        pdf_path = generate_semantic_report(result, job_id, job_dir)
-        result["pdf_report_url"] = f"/download/{job_id}/{os.path.basename(pdf_path)}"
-
+        # Report the results now; the PDF link is added once it has rendered
+        _mark_pdf_pending(result)
         store.save_job(job_id, {
             "result": result,
             "status": "completed",
             "progress": 100,
             "step": "Done"
         })
+        _render_pdf_async(job_id, generate_semantic_report, result, job_id, job_dir)
 
     except Exception as e:
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
         store.save_job(job_id, {
             "status": "failed",
             "error": error_details,
@@ -1835,9 +2064,6 @@ def process_semantic_validation(job_id, page_url, job_dir):
 
 @app.get("/api/semantic/history")
 def get_semantic_history():
-    jobs = store.list_jobs()
-    semantic_jobs = [j for j in jobs if j.get("type") == "semantic_validation"]
-
     try:
         page = int(request.args.get("page", 1))
         limit = int(request.args.get("limit", 10))
@@ -1851,13 +2077,13 @@ def get_semantic_history():
         limit = 10
 
     start = (page - 1) * limit
-    end = start + limit
-
-    paginated_jobs = semantic_jobs[start:end]
+    # Listed jobs expire a stuck pdf_pending just like /api/status does
+    paginated_jobs = [_expire_pdf_pending(job.get("job_id"), job)
+                      for job in store.list_jobs(job_type="semantic_validation", offset=start, limit=limit)]
 
     return jsonify({
         "jobs": paginated_jobs,
-        "total": len(semantic_jobs),
+        "total": store.count_jobs(job_type="semantic_validation"),
         "page": page,
         "limit": limit
     })
@@ -1871,14 +2097,7 @@ def delete_semantic_history():
     if not job_ids:
         return jsonify({"error": "No job IDs provided"}), 400
 
-    for jid in job_ids:
-        store.delete_job(jid)
-        jdir = os.path.join(RUNS_DIR, jid)
-        if os.path.exists(jdir):
-            import shutil
-            shutil.rmtree(jdir)
-
-    return jsonify({"message": f"Deleted {len(job_ids)} job(s)"}), 200
+    return _delete_jobs(job_ids)
 
 
 # ─── AI Functional Testing Routes ───
@@ -1888,13 +2107,28 @@ def functional_page():
     return app.send_static_file("functional.html")
 
 
+# Kept-alive connections for the Ollama status poll
+_ollama_session = requests.Session()
+_ollama_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=32))
+_ollama_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=32))
+
+
 @app.get("/api/functional/ollama-status")
 def check_ollama_status():
     """Check if Ollama is running and list available models"""
-    import requests as req_lib
     ollama_url = request.args.get("url", "http://localhost:11434")
     try:
-        resp = req_lib.get(f"{ollama_url}/api/tags", timeout=3)
+        # Cheap TCP probe first, so a stopped Ollama is reported in ~0.3 s
+        # instead of holding the worker for the HTTP timeout
+        parsed = urlparse(ollama_url)
+        # No host (e.g. "localhost:11434" parses as scheme "localhost"): there
+        # is nothing to probe, and a None host would silently try loopback:80
+        if not parsed.hostname:
+            return jsonify({"available": False, "models": []})
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        socket.create_connection((parsed.hostname, port), timeout=0.3).close()
+
+        resp = _ollama_session.get(f"{ollama_url}/api/tags", timeout=1.0)
         if resp.status_code == 200:
             data = resp.json()
             models = [m.get("name", "") for m in data.get("models", [])]
@@ -1904,12 +2138,11 @@ def check_ollama_status():
     return jsonify({"available": False, "models": []})
 
 
-@app.get("/api/functional/template")
-def download_functional_template():
-    """Generate and return a sample Excel template for functional test cases"""
-    import pandas as pd
-    import io
+FUNCTIONAL_TEMPLATE_PATH = os.path.join(RUNS_DIR, "functional_test_template.xlsx")
+
 
+def _build_functional_template(path):
+    """Write the sample Excel template for functional test cases to `path`"""
     sample_data = {
         "Test_ID": ["TC_001", "TC_002", "TC_003", "TC_004", "TC_005"],
         "Component": ["Navigation", "Search", "Search", "Cart", "Footer"],
@@ -1930,16 +2163,30 @@ def download_functional_template():
         ]
     }
 
-    df = pd.DataFrame(sample_data)
-    output = io.BytesIO()
-    df.to_excel(output, index=False, sheet_name="Test Cases")
-    output.seek(0)
+    # Write under a temp name so a concurrent worker never serves a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp.xlsx"
+    pd.DataFrame(sample_data).to_excel(tmp_path, index=False, sheet_name="Test Cases")
+    os.replace(tmp_path, path)
+
+
+# The template never changes between requests; build it once per install
+if not os.path.exists(FUNCTIONAL_TEMPLATE_PATH):
+    _build_functional_template(FUNCTIONAL_TEMPLATE_PATH)
+
+
+@app.get("/api/functional/template")
+def download_functional_template():
+    """Return the sample Excel template for functional test cases"""
+    if not os.path.exists(FUNCTIONAL_TEMPLATE_PATH):
+        _build_functional_template(FUNCTIONAL_TEMPLATE_PATH)
 
     return send_file(
-        output,
+        FUNCTIONAL_TEMPLATE_PATH,
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         as_attachment=True,
-        download_name="functional_test_template.xlsx"
+        download_name="functional_test_template.xlsx",
+        conditional=True,
+        max_age=86400
     )
 
 
@@ -1969,7 +2216,9 @@ def run_functional_tests():
 
     # Save Excel file
     excel_path = os.path.join(job_dir, secure_filename(excel_file.filename))
-    excel_file.save(excel_path)
+    # Stream the upload to disk in 1 MiB chunks
+    with open(excel_path, "wb") as out:
+        shutil.copyfileobj(excel_file.stream, out, length=1 << 20)
 
     url_for_display = target_url if input_type == "url" else sitemap_url
 
@@ -1998,42 +2247,41 @@ def run_functional_tests():
 
 def process_functional_tests(job_id, input_type, target_url, sitemap_url, excel_path, ollama_url, ollama_model, job_dir):
     """Background thread for AI functional testing"""
-    import traceback
+    progress = ProgressThrottle(job_id, min_interval=0.25)
 
     try:
-        from utils.functional_test_engine import FunctionalTestEngine, generate_functional_report_pdf
-
         engine = FunctionalTestEngine(ollama_url=ollama_url, ollama_model=ollama_model)
 
-        # Progress callback
+        # Progress callback; per-step writes are coalesced (completed/failed
+        # and progress 100 are written immediately)
         def progress_cb(step, pct):
-            store.save_job(job_id, {"step": step, "progress": pct})
+            progress.update(step=step, progress=pct)
 
         # Check Ollama connectivity
-        store.save_job(job_id, {"step": "Checking Ollama connectivity...", "progress": 2})
+        progress.update(step="Checking Ollama connectivity...", progress=2)
         if not engine.ollama.is_available():
-            store.save_job(job_id, {
-                "status": "failed",
-                "error": "Ollama is not running. Please start Ollama with 'ollama serve' and try again.",
-                "progress": 100,
-                "step": "Failed"
-            })
+            progress.update(
+                status="failed",
+                error="Ollama is not running. Please start Ollama with 'ollama serve' and try again.",
+                progress=100,
+                step="Failed"
+            )
             return
 
         # Parse Excel test cases
-        store.save_job(job_id, {"step": "Parsing Excel test cases...", "progress": 5})
+        progress.update(step="Parsing Excel test cases...", progress=5)
         test_cases = engine.parse_excel_test_cases(excel_path)
 
         if not test_cases:
-            store.save_job(job_id, {
-                "status": "failed",
-                "error": "No test cases found in the Excel file. Please check the format.",
-                "progress": 100,
-                "step": "Failed"
-            })
+            progress.update(
+                status="failed",
+                error="No test cases found in the Excel file. Please check the format.",
+                progress=100,
+                step="Failed"
+            )
             return
 
-        store.save_job(job_id, {"step": f"Found {len(test_cases)} test cases. Starting execution...", "progress": 8})
+        progress.update(step=f"Found {len(test_cases)} test cases. Starting execution...", progress=8)
 
         # Run tests
         if input_type == "url":
@@ -2045,36 +2293,29 @@ def process_functional_tests(job_id, input_type, target_url, sitemap_url, excel_
                 sitemap_url, test_cases, job_id, job_dir, progress_callback=progress_cb
             )
 
-        # Generate PDF report
-        store.save_job(job_id, {"step": "Generating PDF report...", "progress": 92})
-        try:
-            pdf_path = generate_functional_report_pdf(results, job_id, job_dir)
-            results["pdf_report_url"] = f"/download/{job_id}/{os.path.basename(pdf_path)}"
-        except Exception as pdf_err:
-            results["pdf_error"] = str(pdf_err)
-
-        store.save_job(job_id, {
-            "result": results,
-            "status": "completed",
-            "progress": 100,
-            "step": "Done"
-        })
+        # Report the results now; the PDF link is added once it has rendered
+        _mark_pdf_pending(results)
+        progress.update(
+            result=results,
+            status="completed",
+            progress=100,
+            step="Done"
+        )
+        _render_pdf_async(job_id, generate_functional_report_pdf, results, job_id, job_dir)
 
     except Exception as e:
-        error_details = f"{str(e)}\n{traceback.format_exc()}"
-        store.save_job(job_id, {
-            "status": "failed",
-            "error": error_details,
-            "progress": 100,
-            "step": "Failed"
-        })
+        error_details = _short_err(e)
+        logger.exception("Job %s failed", job_id)
+        progress.update(
+            status="failed",
+            error=error_details,
+            progress=100,
+            step="Failed"
+        )
 
 
 @app.get("/api/functional/history")
 def get_functional_history():
-    jobs = store.list_jobs()
-    functional_jobs = [j for j in jobs if j.get("type") == "functional_testing"]
-
     try:
         page = int(request.args.get("page", 1))
         limit = int(request.args.get("limit", 10))
@@ -2088,13 +2329,13 @@ def get_functional_history():
         limit = 10
 
     start = (page - 1) * limit
-    end = start + limit
-
-    paginated_jobs = functional_jobs[start:end]
+    # Listed jobs expire a stuck pdf_pending just like /api/status does
+    paginated_jobs = [_expire_pdf_pending(job.get("job_id"), job)
+                      for job in store.list_jobs(job_type="functional_testing", offset=start, limit=limit)]
 
     return jsonify({
         "jobs": paginated_jobs,
-        "total": len(functional_jobs),
+        "total": store.count_jobs(job_type="functional_testing"),
         "page": page,
         "limit": limit
     })
@@ -2108,14 +2349,7 @@ def delete_functional_history():
     if not job_ids:
         return jsonify({"error": "No job IDs provided"}), 400
 
-    for jid in job_ids:
-        store.delete_job(jid)
-        jdir = os.path.join(RUNS_DIR, jid)
-        if os.path.exists(jdir):
-            import shutil
-            shutil.rmtree(jdir)
-
-    return jsonify({"message": f"Deleted {len(job_ids)} job(s)"}), 200
+    return _delete_jobs(job_ids)
 
 
 # Jira Integration Routes
@@ -2160,9 +2394,9 @@ def create_issue():
         return jsonify({"error": "Jira configuration not found. Please configure Jira first."}), 400
 
     attachment_path = None
-    if job_id and issue_filename:
+    job_dir = _job_dir(job_id) if job_id else None
+    if job_dir and issue_filename:
         # Check in job dir
-        job_dir = os.path.join(RUNS_DIR, secure_filename(job_id))
         attachment_path = os.path.join(job_dir, secure_filename(issue_filename))
         if not os.path.exists(attachment_path):
             attachment_path = None
@@ -2189,151 +2423,84 @@ def delete_history():
         if not job_ids:
             return jsonify({"error": "No job_ids provided"}), 400
             
-        store.delete_jobs(job_ids)
-        
-        # Cleanup directories
-        for job_id in job_ids:
-            safe_id = secure_filename(job_id)
-            job_dir = os.path.join(RUNS_DIR, safe_id)
-            if os.path.exists(job_dir):
-                import shutil
-                try:
-                    shutil.rmtree(job_dir)
-                except Exception:
-                    pass
-                    
-        return jsonify({"success": True})
+        return _delete_jobs(job_ids)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 def process_git_push(job_id, commit_message, branch):
     """Background thread for git push operations - Optimized for speed"""
-    import subprocess
-    
-    # Dynamically find the git root directory to ensure all changes (including root files) are pushed
-    try:
-        root_result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            cwd=BASE_DIR,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        project_dir = root_result.stdout.strip()
-    except Exception:
-        project_dir = BASE_DIR # Fallback
-    
     # Prevent git from opening any editor or interactive prompt
     git_env = os.environ.copy()
     git_env["GIT_TERMINAL_PROMPT"] = "0"
     git_env["GIT_EDITOR"] = "true"
     git_env["GIT_COMMITTER_NAME"] = git_env.get("GIT_COMMITTER_NAME", "Visual Testing Tool")
     git_env["GIT_COMMITTER_EMAIL"] = git_env.get("GIT_COMMITTER_EMAIL", "vt@tool.local")
-    
+
+    # Coalesced job writes; completed/failed states are written immediately
+    progress = ProgressThrottle(job_id, min_interval=0.25)
+
     try:
+        # Stage/commit in-process with pygit2 when possible, else the git CLI, at
+        # the git root so all changes (including root files) are pushed
+        repo = open_git_repo(BASE_DIR, git_env)
+        project_dir = repo.workdir
+
         # Update status: Staging (10%)
-        store.update_job(job_id, {
-            "status": "running",
-            "progress": 10,
-            "step": "Staging changes..."
-        })
-        
-        # Stage all changes
-        add_result = subprocess.run(
-            ["git", "add", "."],
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=15,
-            env=git_env
+        progress.update(
+            status="running",
+            progress=10,
+            step="Staging changes..."
         )
-        
-        if add_result.returncode != 0:
-            store.update_job(job_id, {
-                "status": "failed",
-                "error": f"Failed to stage changes: {add_result.stderr}",
-                "progress": 100
-            })
+
+        try:
+            has_staged_changes = repo.stage_all()
+        except GitOpError as e:
+            progress.update(
+                status="failed",
+                error=f"Failed to stage changes: {e}",
+                progress=100
+            )
             return
-        
+
         # Update status: Committing (40%)
-        store.update_job(job_id, {
-            "progress": 40,
-            "step": "Committing changes..."
-        })
-        
-        # Check if there are changes to commit
-        status_result = subprocess.run(
-            ["git", "diff", "--cached", "--quiet"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            env=git_env
+        progress.update(
+            progress=40,
+            step="Committing changes..."
         )
-        
-        has_staged_changes = status_result.returncode != 0  # returncode 1 = has changes
-        
+
         if has_staged_changes:
-            # Commit changes (with --no-edit to prevent editor from opening)
-            commit_result = subprocess.run(
-                ["git", "commit", "--no-edit", "-m", commit_message],
-                cwd=project_dir,
-                capture_output=True,
-                text=True,
-                timeout=15,
-                env=git_env
-            )
-            
-            if commit_result.returncode != 0:
-                # Check if error is "nothing to commit"
-                combined = commit_result.stdout + commit_result.stderr
-                if "nothing to commit" in combined or "nothing added to commit" in combined:
-                    pass  # Fall through to push — there may be unpushed commits
-                else:
-                    store.update_job(job_id, {
-                        "status": "failed",
-                        "error": f"Failed to commit: {commit_result.stderr}",
-                        "progress": 100
-                    })
-                    return
-        
-        # Check if there are commits to push
-        ahead_result = subprocess.run(
-            ["git", "rev-list", "--count", f"origin/{branch}..HEAD"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            env=git_env
-        )
-        
-        commits_ahead = 0
-        if ahead_result.returncode == 0:
             try:
-                commits_ahead = int(ahead_result.stdout.strip())
-            except ValueError:
-                commits_ahead = 0
-        
+                repo.commit(commit_message)
+            except GitOpError as e:
+                progress.update(
+                    status="failed",
+                    error=f"Failed to commit: {e}",
+                    progress=100
+                )
+                return
+
+        # Check if there are commits to push
+        commits_ahead = repo.commits_ahead(branch)
+
         if commits_ahead == 0 and not has_staged_changes:
-            store.update_job(job_id, {
-                "status": "completed",
-                "progress": 100,
-                "step": "Nothing to push — already up to date",
-                "result": {
+            progress.update(
+                status="completed",
+                progress=100,
+                step="Nothing to push — already up to date",
+                result={
                     "success": True,
                     "message": "Already up to date, nothing to push",
                     "skipped": True
                 }
-            })
+            )
             return
         
         # Update status: Pushing (60%)
-        store.update_job(job_id, {
-            "progress": 60,
-            "step": f"Pushing to {branch}..."
-        })
+        progress.update(
+            progress=60,
+            step=f"Pushing to {branch}..."
+        )
         
         # Push to remote with a longer timeout and --progress for better visibility in logs if needed
         # Note: git push -u might be helpful too but we assume branch exists or is tracked
@@ -2356,38 +2523,39 @@ def process_git_push(job_id, commit_message, branch):
             elif "rejected" in error_msg:
                 error_msg = f"Push rejected. Pull remote changes first. Details: {error_msg}"
             
-            store.update_job(job_id, {
-                "status": "failed",
-                "error": f"Failed to push: {error_msg}",
-                "progress": 100
-            })
+            progress.update(
+                status="failed",
+                error=f"Failed to push: {error_msg}",
+                progress=100
+            )
             return
         
         # Success! (100%)
-        store.update_job(job_id, {
-            "status": "completed",
-            "progress": 100,
-            "step": "Successfully pushed to GitHub!",
-            "result": {
+        progress.update(
+            status="completed",
+            progress=100,
+            step="Successfully pushed to GitHub!",
+            result={
                 "success": True,
                 "message": f"Successfully pushed to {branch}",
                 "commit_message": commit_message,
                 "branch": branch
             }
-        })
+        )
         
     except subprocess.TimeoutExpired as e:
-        store.update_job(job_id, {
-            "status": "failed",
-            "error": "Operation timed out. Check your internet connection and try again.",
-            "progress": 100
-        })
+        progress.update(
+            status="failed",
+            error="Operation timed out. Check your internet connection and try again.",
+            progress=100
+        )
     except Exception as e:
-        store.update_job(job_id, {
-            "status": "failed",
-            "error": str(e),
-            "progress": 100
-        })
+        logger.exception("Job %s failed", job_id)
+        progress.update(
+            status="failed",
+            error=str(e),
+            progress=100
+        )
 
 
 @app.post("/api/git/push")
@@ -2398,9 +2566,6 @@ def git_push():
     Returns immediately with a job_id for status polling
     """
     try:
-        import subprocess
-        import threading
-        
         data = request.json or {}
         commit_message = data.get("commit_message", "🎨 Update from Visual Testing Tool")
         branch = data.get("branch", "main")
@@ -2455,50 +2620,62 @@ def git_push():
         }), 500
 
 
-@app.get("/api/git/status")
-def git_status():
-    """Get current git status"""
-    try:
-        import subprocess
-        
-        project_dir = BASE_DIR
-        
-        # Get branch
-        branch_result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True
-        )
-        current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
-        
-        # Get status
-        status_result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=project_dir,
-            capture_output=True,
-            text=True
-        )
-        
-        has_changes = bool(status_result.stdout.strip())
-        
-        # Get last commit
+GIT_STATUS_TTL = 2  # seconds a git status snapshot is reused for
+
+
+@lru_cache(maxsize=1)
+def _git_status_snapshot(_bucket):
+    """
+    Branch, changes and last commit of BASE_DIR's repo. `_bucket` is the
+    current GIT_STATUS_TTL time slot, so polls within one slot share a result.
+    """
+    # One call yields the branch header and the changed paths
+    status_result = subprocess.run(
+        ["git", "status", "--porcelain=v2", "--branch"],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True
+    )
+    
+    current_branch = "unknown"
+    head_oid = None
+    changes_count = 0
+    for line in status_result.stdout.splitlines():
+        if line.startswith("# branch.head "):
+            current_branch = line[len("# branch.head "):]
+            if current_branch == "(detached)":
+                current_branch = "HEAD"
+        elif line.startswith("# branch.oid "):
+            head_oid = line[len("# branch.oid "):]
+        elif line and not line.startswith("#"):
+            changes_count += 1
+    
+    # Get last commit
+    last_commit = "No commits"
+    if head_oid and head_oid != "(initial)":
         log_result = subprocess.run(
             ["git", "log", "-1", "--pretty=format:%h - %s (%ar)"],
-            cwd=project_dir,
+            cwd=BASE_DIR,
             capture_output=True,
             text=True
         )
-        last_commit = log_result.stdout.strip() if log_result.returncode == 0 else "No commits"
-        
-        return jsonify({
-            "success": True,
-            "current_branch": current_branch,
-            "has_changes": has_changes,
-            "changes_count": len(status_result.stdout.strip().split('\n')) if has_changes else 0,
-            "last_commit": last_commit
-        })
-        
+        if log_result.returncode == 0:
+            last_commit = log_result.stdout.strip()
+    
+    return {
+        "success": True,
+        "current_branch": current_branch,
+        "has_changes": changes_count > 0,
+        "changes_count": changes_count,
+        "last_commit": last_commit
+    }
+
+
+@app.get("/api/git/status")
+def git_status():
+    """Get current git status"""
+    try:
+        return jsonify(_git_status_snapshot(int(time.monotonic() // GIT_STATUS_TTL)))
     except Exception as e:
         return jsonify({
             "success": False,
@@ -2513,23 +2690,32 @@ def git_status():
 GITHUB_CONFIG_FILE = os.path.join(BASE_DIR, "github_config.json")
 CI_RESULTS_DIR = os.path.join(BASE_DIR, "ci_visual_results")
 os.makedirs(CI_RESULTS_DIR, exist_ok=True)
+CI_RESULTS_LIMIT = 50
+_ci_summaries = {}  # result filename -> (mtime_ns, dashboard summary)
 
-# In-memory store for PR test run tracking
-pr_runs = {}   # pr_number -> { sha, job_ids, status, created_at }
+# PR test run tracking: pr_number -> { sha, job_ids, status, created_at }, aged
+# out after a week. In-process by default, shared through Redis when REDIS_URL
+# is set; pr_run_claims stops duplicate webhooks re-running the same commit.
+pr_runs, pr_run_claims = make_pr_run_tracking()
+
+# PR visual tests (screenshots, diffs, PDFs) run on their own small pool, so a
+# burst of PR events queues up behind PR_TEST_WORKERS instead of each event
+# starting a thread, and regular jobs on JOB_POOL aren't starved
+PR_POOL = ThreadPoolExecutor(max_workers=int(os.environ.get("PR_TEST_WORKERS", 2)), thread_name_prefix="pr")
+# Pages of one PR run captured at once (each in its own context on the shared browser)
+PR_CAPTURE_WORKERS = int(os.environ.get("PR_CAPTURE_WORKERS", 4))
 
 
 def _load_gh_config() -> dict:
-    if os.path.exists(GITHUB_CONFIG_FILE):
-        with open(GITHUB_CONFIG_FILE) as f:
-            return json.load(f)
-    return {}
+    # Re-parsed only when the file's mtime/size changes
+    return load_json_config(GITHUB_CONFIG_FILE)
 
 
 def _save_gh_config(data: dict):
     existing = _load_gh_config()
     existing.update(data)
-    with open(GITHUB_CONFIG_FILE, "w") as f:
-        json.dump(existing, f, indent=2)
+    # Atomic replace; no write at all when nothing changed
+    save_json_config(GITHUB_CONFIG_FILE, existing)
 
 
 # ─── Config ─────────────────────────────────────────────────────────────────
@@ -2543,6 +2729,13 @@ def get_github_config():
     return jsonify(safe)
 
 
+# Reuses the TLS connection to api.github.com across config saves
+_github_session = requests.Session()
+_github_session.mount("https://", HTTPAdapter(
+    pool_connections=10, pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])))
+
+
 @app.post("/api/github/config")
 def save_github_config():
     data = request.get_json()
@@ -2556,10 +2749,9 @@ def save_github_config():
 
     # Test connection
     try:
-        import requests as req
-        r = req.get("https://api.github.com/user",
-                    headers={"Authorization": f"token {token}", "Accept": "application/vnd.github+json"},
-                    timeout=10)
+        r = _github_session.get("https://api.github.com/user",
+                                headers={"Authorization": f"token {token}", "Accept": "application/vnd.github+json"},
+                                timeout=10)
         if r.status_code != 200:
             return jsonify({"success": False, "error": f"GitHub auth failed: HTTP {r.status_code}"}), 400
         login = r.json().get("login", "?")
@@ -2575,7 +2767,6 @@ def save_github_config():
 
 @app.post("/api/github/issue")
 def create_github_issue():
-    from utils.github_client import create_issue
     data = request.get_json()
     title   = data.get("title", "").strip()
     body    = data.get("body", "").strip()
@@ -2593,7 +2784,7 @@ def create_github_issue():
             body += f"\n**File:** `{fname}`"
         body += f"\n**Diff Overlay:** /download/{job_id}/diff_overlay.png"
 
-    result = create_issue(title=title, body=body, labels=labels)
+    result = create_gh_issue(title=title, body=body, labels=labels)
     if result.get("success"):
         return jsonify(result)
     return jsonify(result), 500
@@ -2603,18 +2794,20 @@ def create_github_issue():
 
 @app.get("/api/github/prs")
 def list_prs():
-    from utils.github_client import list_open_prs
     return jsonify(list_open_prs())
 
 
 @app.get("/api/github/pr/<int:pr_number>")
 def get_pr(pr_number):
-    from utils.github_client import get_pr_info
     return jsonify(get_pr_info(pr_number))
 
 
 # ─── Webhook Receiver ────────────────────────────────────────────────────────
 
+# PR label that overrides the staging URL, e.g. "staging-url:https://pr-12.example.com"
+STAGING_URL_LABEL = "staging-url:"
+
+
 @app.post("/api/github/webhook")
 def github_webhook():
     """
@@ -2622,19 +2815,22 @@ def github_webhook():
     On pull_request (opened/synchronize/reopened) → trigger visual tests.
     On push to main/staging → optionally refresh baselines.
     """
-    from utils.github_client import verify_webhook_signature, post_commit_status
 
     cfg = _load_gh_config()
     secret = cfg.get("webhook_secret", "")
 
     # Verify signature
     sig_header = request.headers.get("X-Hub-Signature-256", "")
-    payload_bytes = request.get_data()
+    payload_bytes = request.get_data(cache=False)
     if secret and not verify_webhook_signature(payload_bytes, sig_header, secret):
         return jsonify({"error": "Invalid webhook signature"}), 401
 
     event = request.headers.get("X-GitHub-Event", "")
-    data  = request.get_json(force=True) or {}
+    # Parse the bytes already read for the signature (orjson when installed)
+    try:
+        data = (app.json.loads(payload_bytes) if payload_bytes else None) or {}
+    except ValueError:
+        return jsonify({"error": "Invalid JSON payload"}), 400
 
     if event == "ping":
         return jsonify({"message": "pong", "success": True})
@@ -2655,27 +2851,22 @@ def github_webhook():
         if draft:
             return jsonify({"message": "Skipping draft PR"})
 
-        # Post pending status immediately
-        if sha:
-            post_commit_status(sha=sha, state="pending",
-                               description="Visual regression tests queued",
-                               context="visual-regression/qa-framework")
-
         # Determine staging URL strategy:
         # 1. PR label: staging-url:https://...
         # 2. Config staging_base_url + /pr-{pr_num}
         # 3. Config staging_url directly
-        staging_url = ""
-        for label in pr.get("labels", []):
-            lname = label.get("name", "")
-            if lname.startswith("staging-url:"):
-                staging_url = lname.replace("staging-url:", "").strip()
-                break
+        staging_url = next((label["name"].removeprefix(STAGING_URL_LABEL).strip()
+                            for label in pr.get("labels", ())
+                            if label.get("name", "").startswith(STAGING_URL_LABEL)), "")
 
         if not staging_url:
             staging_url = (cfg.get("staging_base_url", "").rstrip("/") + f"/pr-{pr_num}"
                            if cfg.get("staging_base_url") else cfg.get("staging_url", ""))
 
+        # A redelivered or duplicate event for a commit already being tested
+        if staging_url and sha and not pr_run_claims.claim(sha):
+            return jsonify({"message": "Visual test already queued for this commit", "pr": pr_num})
+
         # Store PR tracking info
         pr_runs[str(pr_num)] = {
             "pr_number": pr_num,
@@ -2690,14 +2881,10 @@ def github_webhook():
         }
 
         if staging_url:
-            # Trigger async visual test run
-            thread = threading.Thread(
-                target=process_pr_visual_test,
-                args=(pr_num, sha, staging_url, branch, title),
-                daemon=True
-            )
-            thread.start()
-            return jsonify({"message": "Visual test queued", "pr": pr_num, "staging_url": staging_url})
+            # Queue the visual test run
+            PR_POOL.submit(process_pr_visual_test, pr_num, sha, staging_url, branch, title,
+                           claimed=bool(sha))
+            return jsonify({"message": "Visual test queued", "pr": pr_num, "staging_url": staging_url}), 202
         else:
             return jsonify({"message": "No staging URL — test skipped (add staging-url label or configure staging_url)"})
 
@@ -2714,44 +2901,52 @@ def github_webhook():
 
 # ─── PR Visual Test Runner ───────────────────────────────────────────────────
 
-def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: str, pr_title: str):
+def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: str, pr_title: str,
+                           claimed: bool = False):
     """
     Background worker: runs visual tests for a PR and reports back to GitHub.
     This mirrors what GitHub Actions does but runs directly on this server.
+    `claimed` is True when the caller took pr_run_claims for `sha`; only then
+    is the claim released when the run ends.
     """
-    from utils.github_client import (
-        post_commit_status, upsert_pr_comment,
-        get_pr_info, build_pr_comment
-    )
-    import json as json_  # local alias to avoid shadowing
-
     cfg = _load_gh_config()
     pr_key = str(pr_number)
-
-    pr_runs[pr_key]["status"] = "running"
+    run = {"pr_number": pr_number, "sha": sha}
 
     try:
-        import json as json_mod
-        import shutil
+        # Work on our own copy of the run and write it back on each status change,
+        # so it lands even if the cache evicted it (and reaches Redis when shared)
+        run = pr_runs.get(pr_key) or run
+        run["status"] = "running"
+        pr_runs[pr_key] = run
+
+        # The pending status goes out from this worker, not the request thread
+        # or another pool, so it can never land after the final status below
+        if sha:
+            post_commit_status(sha=sha, state="pending",
+                               description="Visual regression tests running",
+                               context=STATUS_CONTEXT)
 
-        ci_cfg_path = os.path.join(BASE_DIR, "ci_visual_config.json")
         baseline_dir = os.path.join(BASE_DIR, "design_baselines")
 
         if not os.path.exists(baseline_dir):
             os.makedirs(baseline_dir, exist_ok=True)
 
-        # Load CI config
-        if os.path.exists(ci_cfg_path):
-            with open(ci_cfg_path) as f:
-                ci_cfg = json_mod.load(f)
-        else:
+        # Load CI config (cached until the file changes)
+        ci_cfg = _load_ci_config()
+        if ci_cfg is None:
             ci_cfg = {"threshold": {"ssim_min": 0.85, "change_ratio_max": 0.05, "fail_on_any": True},
                       "urls_to_test": [{"name": "Homepage", "path": "/", "baseline": "homepage", "enabled": True}],
                       "noise_tolerance": "medium"}
 
         tests = ci_cfg.get("urls_to_test", [])
-        results = []
+        results = []   # (config index, result) so the comment keeps config order
         job_ids = []
+        pending = []   # tests with a baseline, ready to capture
+        # One directory read instead of an exists() per test
+        with os.scandir(baseline_dir) as it:
+            design_baselines = {e.name[:-4]: e.path for e in it if e.name.endswith(".png")}
+        throttles = {}  # job_id -> ProgressThrottle; only terminal updates always hit the store
 
         for i, test in enumerate(tests, 1):
             if not test.get("enabled", True):
@@ -2763,15 +2958,15 @@ def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: s
             bl_key = test.get("baseline", "")
 
             # Find baseline
-            bl_path = os.path.join(baseline_dir, f"{bl_key}.png")
-            if not os.path.exists(bl_path):
+            bl_path = design_baselines.get(bl_key)
+            if bl_path is None:
                 # Try baseline from store
                 bl_store_path = baseline_store.get_active_baseline_path_by_slug(bl_key) if hasattr(baseline_store, "get_active_baseline_path_by_slug") else None
                 if bl_store_path and os.path.exists(bl_store_path):
                     bl_path = bl_store_path
                 else:
-                    results.append({"name": name, "url": url, "passed": False,
-                                    "error": f"No baseline: {bl_key}", "status": "skipped"})
+                    results.append((i, {"name": name, "url": url, "passed": False,
+                                        "error": f"No baseline: {bl_key}", "status": "skipped"}))
                     continue
 
             # Create job
@@ -2780,7 +2975,7 @@ def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: s
             os.makedirs(job_dir, exist_ok=True)
 
             figma_path = os.path.join(job_dir, "figma.png")
-            shutil.copy2(bl_path, figma_path)
+            _link_or_copy(bl_path, figma_path)
 
             store.save_job(job_id, {
                 "job_id": job_id, "type": "visual_testing_pr",
@@ -2791,40 +2986,56 @@ def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: s
                 "result": None,
             })
             job_ids.append(job_id)
+            throttles[job_id] = ProgressThrottle(job_id)
+            pending.append((i, name, url, test, job_id, job_dir, figma_path))
+
+        def capture_one(url, test, job_id, job_dir):
+            stage_path = os.path.join(job_dir, "stage.png")
+            viewport = test.get("viewport", ci_cfg.get("viewport", "1440x900"))
+            fullpage = test.get("fullpage", ci_cfg.get("fullpage", True))
+            wait_time = test.get("wait_time_ms", ci_cfg.get("wait_time_ms", 2000))
+
+            throttles[job_id].update(step="Capturing screenshot...", progress=20)
+            capture_screenshot(url, stage_path, viewport=viewport, fullpage=fullpage, wait_time=wait_time)
+            return stage_path
+
+        def record_failure(i, name, url, job_id, e):
+            throttles[job_id].update(status="failed", error=str(e), progress=0)
+            results.append((i, {"name": name, "url": url, "job_id": job_id, "passed": False,
+                                "error": str(e), "status": "failed"}))
+
+        # Captures wait on the network, so several pages load at once; each
+        # finished capture goes straight to PDF_POOL for the CPU-bound diff
+        # and PDF while the rest are still loading
+        comparisons = {}
+        with ThreadPoolExecutor(max_workers=PR_CAPTURE_WORKERS, thread_name_prefix="pr-capture") as capture_pool:
+            captures = {capture_pool.submit(capture_one, item[2], item[3], item[4], item[5]): item
+                        for item in pending}
+            for future in as_completed(captures):
+                i, name, url, test, job_id, job_dir, figma_path = item = captures[future]
+                try:
+                    stage_path = future.result()
+                    throttles[job_id].update(step="Comparing images...", progress=55)
+                    compare_kwargs = {
+                        "noise_tolerance": test.get("noise_tolerance", ci_cfg.get("noise_tolerance", "medium")),
+                        "check_layout": ci_cfg.get("check_layout", True),
+                        "check_content": ci_cfg.get("check_content", True),
+                        "check_colors": ci_cfg.get("check_colors", True),
+                    }
+                    comparisons[PDF_POOL.submit(compare_and_report, job_id, url, figma_path,
+                                                stage_path, job_dir, compare_kwargs)] = item
+                except Exception as e:
+                    record_failure(i, name, url, job_id, e)
 
+        ssim_min   = ci_cfg["threshold"].get("ssim_min", 0.85)
+        change_max = ci_cfg["threshold"].get("change_ratio_max", 0.05)
+
+        for future in as_completed(comparisons):
+            i, name, url, test, job_id, job_dir, figma_path = comparisons[future]
             try:
-                # Screenshot
-                stage_path = os.path.join(job_dir, "stage.png")
-                viewport = test.get("viewport", ci_cfg.get("viewport", "1440x900"))
-                fullpage = test.get("fullpage", ci_cfg.get("fullpage", True))
-                wait_time = test.get("wait_time_ms", ci_cfg.get("wait_time_ms", 2000))
-
-                store.save_job(job_id, {"step": "Capturing screenshot...", "progress": 20})
-                capture_screenshot(url, stage_path, viewport=viewport, fullpage=fullpage, wait_time=wait_time)
-
-                # Compare
-                store.save_job(job_id, {"step": "Comparing images...", "progress": 55})
-                noise = test.get("noise_tolerance", ci_cfg.get("noise_tolerance", "medium"))
-                cmp = compare_images(figma_path, stage_path, job_dir,
-                                     noise_tolerance=noise, highlight_diffs=True,
-                                     check_layout=ci_cfg.get("check_layout", True),
-                                     check_content=ci_cfg.get("check_content", True),
-                                     check_colors=ci_cfg.get("check_colors", True))
-
-                # Thresholds
-                ssim_min   = ci_cfg["threshold"].get("ssim_min", 0.85)
-                change_max = ci_cfg["threshold"].get("change_ratio_max", 0.05)
+                cmp = future.result()
                 passed = cmp["ssim"] >= ssim_min and cmp["change_ratio"] <= change_max
 
-                # PDF Report
-                store.save_job(job_id, {"step": "Generating report...", "progress": 80})
-                pdf_path = os.path.join(job_dir, "report.pdf")
-                try:
-                    build_pdf_report(pdf_path=pdf_path, job_id=job_id, stage_url=url,
-                                     metrics=cmp, figma_path=figma_path)
-                except Exception:
-                    pass
-
                 final_result = {
                     "job_id": job_id,
                     "passed": passed,
@@ -2838,19 +3049,19 @@ def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: s
                         "figma_png": f"/download/{job_id}/figma.png",
                     }
                 }
-                store.save_job(job_id, {"status": "completed", "progress": 100,
-                                        "step": "Done", "result": final_result})
+                throttles[job_id].update(status="completed", progress=100,
+                                         step="Done", result=final_result)
 
-                results.append({
+                results.append((i, {
                     "name": name, "url": url, "job_id": job_id, "passed": passed,
                     "ssim": cmp["ssim"], "change_ratio": cmp["change_ratio"],
                     "num_regions": cmp["num_regions"], "status": "passed" if passed else "failed"
-                })
+                }))
 
             except Exception as e:
-                store.save_job(job_id, {"status": "failed", "error": str(e), "progress": 0})
-                results.append({"name": name, "url": url, "job_id": job_id, "passed": False,
-                                 "error": str(e), "status": "failed"})
+                record_failure(i, name, url, job_id, e)
+
+        results = [r for _, r in sorted(results, key=lambda pair: pair[0])]
 
         # ── Post back to GitHub ──
         failed = sum(1 for r in results if not r.get("passed"))
@@ -2858,34 +3069,35 @@ def process_pr_visual_test(pr_number: int, sha: str, staging_url: str, branch: s
         final_desc  = (f"All {len(results)} visual checks passed"
                        if failed == 0 else f"{failed}/{len(results)} visual check(s) failed")
 
-        if sha:
-            post_commit_status(sha=sha, state=final_state, description=final_desc,
-                               context="visual-regression/qa-framework")
-
+        comment = ""
         if pr_number:
             pr_info = {"title": pr_title, "branch": branch, "base_branch": "main",
                        "sha": sha, "html_url": "", "success": True}
             server_url = cfg.get("server_url", "http://127.0.0.1:7860")
             comment = build_pr_comment(results, pr_info, server_url=server_url)
-            upsert_pr_comment(pr_number, comment)
+        finalize_pr(sha, final_state, final_desc, pr_number, comment)
 
-        pr_runs[pr_key]["status"] = "completed"
-        pr_runs[pr_key]["job_ids"] = job_ids
-        pr_runs[pr_key]["passed"] = failed == 0
-        pr_runs[pr_key]["results"] = results
+        run["status"] = "completed"
+        run["job_ids"] = job_ids
+        run["passed"] = failed == 0
+        run["results"] = results
+        pr_runs[pr_key] = run
 
     except Exception as e:
         print(f"PR visual test error (PR#{pr_number}): {e}")
-        pr_runs[pr_key]["status"] = "failed"
-        pr_runs[pr_key]["error"] = str(e)
+        run["status"] = "failed"
+        run["error"] = str(e)
+        pr_runs[pr_key] = run
         if sha:
             try:
-                from utils.github_client import post_commit_status
                 post_commit_status(sha=sha, state="error",
                                    description=f"Visual test error: {str(e)[:100]}",
-                                   context="visual-regression/qa-framework")
+                                   context=STATUS_CONTEXT)
             except Exception:
                 pass
+    finally:
+        if claimed:
+            pr_run_claims.release(sha)
 
 
 # ─── PR Dashboard API ────────────────────────────────────────────────────────
@@ -2896,6 +3108,14 @@ def get_pr_runs():
     return jsonify(list(pr_runs.values()))
 
 
+@app.post("/api/github/pr-runs/gc")
+def gc_pr_runs():
+    """Drop expired PR runs now, and job folders past JOB_RETENTION_DAYS if set."""
+    pr_runs.expire()
+    purged = _purge_old_job_dirs(JOB_RETENTION_DAYS) if JOB_RETENTION_DAYS > 0 else []
+    return jsonify({"success": True, "pr_runs": len(pr_runs), "purged_jobs": len(purged)})
+
+
 @app.get("/api/github/pr-runs/<int:pr_number>")
 def get_pr_run(pr_number):
     """Get status of a specific PR run."""
@@ -2928,12 +3148,7 @@ def trigger_pr_run(pr_number):
         "job_ids": [],
     }
 
-    thread = threading.Thread(
-        target=process_pr_visual_test,
-        args=(pr_number, sha, staging_url, branch, title),
-        daemon=True
-    )
-    thread.start()
+    PR_POOL.submit(process_pr_visual_test, pr_number, sha, staging_url, branch, title)
     return jsonify({"success": True, "message": "PR visual test triggered", "pr_number": pr_number})
 
 
@@ -2941,15 +3156,22 @@ def trigger_pr_run(pr_number):
 
 @app.get("/api/ci/results")
 def list_ci_results():
-    """List CI result JSON files."""
+    """List the newest CI result JSON files."""
+    # Result files are named results_<timestamp>.json, so the newest are the
+    # largest names; only those get stat'd and parsed
+    with os.scandir(CI_RESULTS_DIR) as it:
+        names = heapq.nlargest(CI_RESULTS_LIMIT, (e.name for e in it if e.name.endswith(".json")))
+
     results = []
-    for fname in sorted(os.listdir(CI_RESULTS_DIR), reverse=True):
-        if fname.endswith(".json"):
-            fpath = os.path.join(CI_RESULTS_DIR, fname)
-            try:
-                with open(fpath) as f:
-                    d = json.load(f)
-                results.append({
+    for fname in names:
+        fpath = os.path.join(CI_RESULTS_DIR, fname)
+        try:
+            mtime = os.stat(fpath).st_mtime_ns
+            cached = _ci_summaries.get(fname)
+            if cached is None or cached[0] != mtime:
+                with open(fpath, "rb") as f:
+                    d = app.json.loads(f.read())
+                cached = _ci_summaries[fname] = (mtime, {
                     "file": fname,
                     "timestamp": d.get("timestamp"),
                     "staging_url": d.get("staging_url"),
@@ -2959,9 +3181,14 @@ def list_ci_results():
                     "failed": d.get("failed", 0),
                     "build_should_fail": d.get("build_should_fail", False),
                 })
-            except Exception:
-                pass
-    return jsonify(results[:50])
+            results.append(cached[1])
+        except Exception:
+            pass
+
+    # Keep summaries only for files still in the listing
+    for fname in set(_ci_summaries).difference(names):
+        _ci_summaries.pop(fname, None)
+    return jsonify(results)
 
 
 # ─── GitHub Pages ────────────────────────────────────────────────────────────
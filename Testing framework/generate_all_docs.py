@@ -0,0 +1,76 @@
+"""
+Build every documentation PDF in one run:
+
+    python generate_all_docs.py
+
+Files are written to the current directory, as with the individual scripts.
+"""
+
+import multiprocessing
+import os
+import signal
+import sys
+import traceback
+
+from generate_ai_prompt_guide import generate_prompt_guide
+from generate_cheatsheet_pdf import generate_cheat_sheet
+from generate_documentation import generate_pdf_documentation
+from generate_flow_pdf import generate_flow_diagram
+
+# Handle "[Errno 32] Broken pipe" gracefully
+try:
+    signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+except Exception:
+    pass
+
+GENERATORS = (generate_prompt_guide, generate_cheat_sheet, generate_flow_diagram, generate_pdf_documentation)
+
+
+def _run_forked(generate):
+    """Child side of build_all(): run one generator and exit without returning."""
+    code = 0
+    try:
+        generate()
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(code)
+
+
+def build_all():
+    """
+    Build every PDF in its own process so the pure-Python layout work runs
+    on separate cores. On POSIX the children are forked, starting with
+    ReportLab and the generator modules already loaded; elsewhere they are
+    multiprocessing.Process workers. Raises RuntimeError naming any
+    generator that failed.
+    """
+    if hasattr(os, "fork"):
+        # Don't let buffered output be written once per child
+        sys.stdout.flush()
+        sys.stderr.flush()
+        children = {}
+        for generate in GENERATORS:
+            pid = os.fork()
+            if pid == 0:
+                _run_forked(generate)
+            children[pid] = generate.__name__
+        failed = [name for pid, name in children.items()
+                  if os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) != 0]
+    else:
+        procs = [multiprocessing.Process(target=generate, name=generate.__name__) for generate in GENERATORS]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        failed = [proc.name for proc in procs if proc.exitcode != 0]
+
+    if failed:
+        raise RuntimeError(f"PDF generation failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    build_all()
@@ -1,25 +1,13 @@
+import io
 import os
+from functools import cache
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import mm
-from reportlab.lib.colors import HexColor
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Preformatted, Spacer
+from reportlab.lib.styles import ParagraphStyle
+from pdf_common import PALETTE, cached_flowable, restore_cached_pdf, sample_styles, save_pdf
 
-pdf_path = os.path.join(os.getcwd(), "AI_Functional_Testing_Flow_Diagram.pdf")
-
-doc = SimpleDocTemplate(pdf_path, pagesize=landscape(A4), leftMargin=15*mm, rightMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
-
-styles = getSampleStyleSheet()
-title_style = ParagraphStyle('CustomTitle', parent=styles['Title'], fontSize=22, textColor=HexColor('#1e293b'), spaceAfter=10)
-code_style = ParagraphStyle('CustomCode', parent=styles['Normal'], fontName='Courier', fontSize=10, textColor=HexColor('#0f172a'), leading=14, spaceBefore=10)
-
-elements = []
-
-# Title
-elements.append(Paragraph("AI Functional Testing - Engine Architecture & Execution Flow", title_style))
-elements.append(Spacer(1, 4*mm))
-
-flow_diagram = """
+FLOW_DIAGRAM = """
 ┌────────────────────────────────────────────────────────────────────────────────────────┐
 │                              USER / CI TRIGGER PHASE                                   │
 └────────────────────────────────────────────────────────────────────────────────────────┘
@@ -81,10 +69,51 @@ flow_diagram = """
          └──▶ 3. Compiles high-resolution PDF for immediate user download
 """
 
-# Format whitespace appropriately for Courier display
-formatted_flow = flow_diagram.replace(" ", "&nbsp;").replace("\n", "<br/>")
 
-elements.append(Paragraph(formatted_flow, code_style))
+@cache
+def _styles():
+    """Paragraph styles for the diagram. Built once per process."""
+    styles = sample_styles()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Title'], fontSize=22, textColor=PALETTE['slate_800'], spaceAfter=10)
+    code_style = ParagraphStyle('CustomCode', parent=styles['Normal'], fontName='Courier', fontSize=10, textColor=PALETTE['slate_900'], leading=14, spaceBefore=10)
+    return title_style, code_style
+
+
+@cached_flowable
+def _diagram():
+    """
+    The diagram as one Preformatted flowable, which keeps its spaces and line
+    breaks with no markup to parse. Not a Table: the diagram runs over two
+    pages and a table cell cannot split.
+    """
+    return Preformatted(FLOW_DIAGRAM, _styles()[1])
+
+
+def generate_flow_diagram(pdf_path=None):
+    if pdf_path is None:
+        pdf_path = os.path.abspath("AI_Functional_Testing_Flow_Diagram.pdf")
+    if restore_cached_pdf(pdf_path, __file__):
+        print(f"✅ Generated Flow Diagram PDF at: {pdf_path} (cached)")
+        return pdf_path
+
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=landscape(A4), leftMargin=15*mm, rightMargin=15*mm, topMargin=15*mm, bottomMargin=15*mm)
+
+    title_style, _code_style = _styles()
+
+    elements = []
+
+    # Title
+    elements.append(Paragraph("AI Functional Testing - Engine Architecture & Execution Flow", title_style))
+    elements.append(Spacer(1, 4*mm))
+
+    elements.append(_diagram())
+
+    doc.build(elements)
+    save_pdf(pdf_path, buf.getvalue(), __file__)
+    print(f"✅ Generated Flow Diagram PDF at: {pdf_path}")
+    return pdf_path
+
 
-doc.build(elements)
-print(f"✅ Generated Flow Diagram PDF at: {pdf_path}")
+if __name__ == "__main__":
+    generate_flow_diagram()
@@ -0,0 +1,176 @@
+"""
+Helpers shared by the standalone PDF generator scripts (generate_*.py).
+"""
+
+import copy
+import hashlib
+import os
+import shutil
+import tempfile
+from functools import cache, lru_cache, wraps
+
+import reportlab
+from reportlab import rl_config
+from reportlab.lib.colors import HexColor
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import paragraph as rl_paragraph, tables as rl_tables
+from reportlab.platypus import ListFlowable, ListItem, Paragraph
+
+# ReportLab uses the C helpers from the rl-accel package (_rl_accel) on its own
+# when installed, and silently falls back to pure Python otherwise. With
+# QA_REQUIRE_RL_ACCEL set, a missing accelerator fails the build instead.
+# The generators stick to the base-14 Type1 fonts, so no TrueType subsetting.
+if os.environ.get("QA_REQUIRE_RL_ACCEL"):
+    import _rl_accel  # noqa: F401
+
+# Compressed page streams written as raw binary (ASCII85 would add ~25%), and
+# invariant output: no timestamps or random IDs, so identical input gives
+# byte-identical PDFs
+rl_config.pageCompression = 1
+rl_config.useA85 = 0
+rl_config.invariant = 1
+
+
+def _install_string_width_cache():
+    """
+    Memoize pdfmetrics.stringWidth for the generators. Paragraph wrapping
+    measures every word, and the documents repeat the same words in the same
+    few base-14 fonts. Paragraph and Table bind stringWidth at import, so
+    their module globals are patched too. Safe to call more than once.
+    """
+    if getattr(pdfmetrics.stringWidth, '__wrapped__', None):
+        return
+    cached = lru_cache(maxsize=8192)(pdfmetrics.stringWidth)
+    pdfmetrics.stringWidth = rl_paragraph.stringWidth = rl_tables.stringWidth = cached
+
+
+_install_string_width_cache()
+
+# Colours used by the generators (Tailwind slate/blue/pink), parsed once and
+# shared so every style and table command refers to the same Color object
+PALETTE = {name: HexColor(value) for name, value in {
+    'slate_900': '#0f172a',
+    'slate_800': '#1e293b',
+    'slate_700': '#334155',
+    'slate_600': '#475569',
+    'slate_300': '#cbd5e1',
+    'slate_200': '#e2e8f0',
+    'slate_100': '#f1f5f9',
+    'slate_50': '#f8fafc',
+    'blue_600': '#2563eb',
+    'pink_700': '#be185d',
+    'pink_100': '#fce7f3',
+    'white': '#ffffff',
+}.items()}
+
+
+@cache
+def sample_styles():
+    """
+    ReportLab's sample stylesheet, built once per process and shared by every
+    generator. Treat it as read-only: derive new ParagraphStyles from it
+    rather than calling .add() on it.
+    """
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=512)
+def _parsed_paragraph(text, style):
+    return Paragraph(text, style)
+
+
+def cached_paragraph(text, style):
+    """
+    Paragraph(text, style), with the markup parsed once per (text, style) pair.
+
+    The generators repeat the same labels ("Why:", "Key Features:", table
+    headers) many times. Each call returns a shallow copy of the parsed
+    Paragraph, because layout state (wrapped size, postponement to the next
+    frame) is stored on the flowable and must not leak into another build.
+    """
+    return copy.copy(_parsed_paragraph(text, style))
+
+
+def cached_flowable(build):
+    """
+    Decorator memoizing a function that assembles a flowable from hashable
+    arguments (e.g. a styled Table from a tuple of rows). Like
+    cached_paragraph, each call returns a shallow copy of the cached object.
+    """
+    cached = lru_cache(maxsize=None)(build)
+
+    @wraps(build)
+    def wrapper(*args):
+        return copy.copy(cached(*args))
+    return wrapper
+
+
+def bullet_list(items, style, indent=30):
+    """
+    A run of bullet points as one ListFlowable instead of a "• ..." Paragraph
+    per line, so the group is laid out in a single pass with hanging bullets.
+    `style` should have no leftIndent of its own; `indent` positions the text
+    and the bullet hangs 10pt to its left.
+    """
+    return ListFlowable([ListItem(cached_paragraph(text, style)) for text in items],
+                        bulletType="bullet", start="•", leftIndent=indent,
+                        bulletDedent=10, bulletFontSize=style.fontSize)
+
+
+# Built PDFs are kept in a content-addressed cache: the key covers the
+# generator's source, this module, the ReportLab version and any extra inputs
+# (e.g. the date printed on a title page). QA_PDF_FORCE=1 always rebuilds.
+PDF_CACHE_DIR = os.environ.get("QA_PDF_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "qa_pdfs"))
+
+
+def _cache_path(pdf_path, source_file, extra):
+    h = hashlib.blake2b(digest_size=8)
+    for path in (source_file, __file__):
+        with open(path, "rb") as f:
+            h.update(f.read())
+    h.update(reportlab.Version.encode())
+    h.update(str(extra).encode())
+    return os.path.join(PDF_CACHE_DIR, f"{h.hexdigest()}_{os.path.basename(pdf_path)}")
+
+
+def restore_cached_pdf(pdf_path, source_file, extra=""):
+    """Copy a cached build of this PDF to pdf_path. Returns False on a miss."""
+    if os.environ.get("QA_PDF_FORCE"):
+        return False
+    cached = _cache_path(pdf_path, source_file, extra)
+    if not os.path.exists(cached):
+        return False
+    # A copy, not a hardlink: a later forced build writes pdf_path in place
+    shutil.copyfile(cached, pdf_path)
+    return True
+
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _write_atomic(path, data):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)  # mkstemp creates 0600; match a normal open()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_pdf(pdf_path, data, source_file, extra=""):
+    """
+    Write a PDF that was built into memory (SimpleDocTemplate on a BytesIO)
+    to pdf_path and to the cache. Each file gets one write and is swapped in
+    with os.replace, so a failed build never leaves a truncated PDF behind.
+    """
+    _write_atomic(pdf_path, data)
+    try:
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        _write_atomic(_cache_path(pdf_path, source_file, extra), data)
+    except OSError:
+        pass  # The cache is best effort
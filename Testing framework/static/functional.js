@@ -8,6 +8,8 @@ let currentJobId = null;
 let pollTimer = null;
 let historyPage = 1;
 const HISTORY_LIMIT = 10;
+// Re-polls while only the PDF is pending (~12 min at 1.5 s)
+const MAX_PDF_POLLS = 480;
 
 // ─── DOM Ready ────────────────────────────────────────────
 document.addEventListener('DOMContentLoaded', () => {
@@ -168,6 +170,8 @@ async function handleSubmit(e) {
 // ─── Polling ──────────────────────────────────────────────
 function startPolling(jobId) {
     if (pollTimer) clearInterval(pollTimer);
+    let renderedPending = false;
+    let pendingPolls = 0;
 
     pollTimer = setInterval(async () => {
         try {
@@ -182,11 +186,26 @@ function startPolling(jobId) {
             updateProgress(progress, step);
 
             if (data.status === 'completed') {
-                clearInterval(pollTimer);
-                pollTimer = null;
+                // The PDF renders after completion: show results now,
+                // then once more when its download link is ready
+                const pdfPending = !!(data.result && data.result.pdf_pending);
+                if (pdfPending && renderedPending) {
+                    // The server gives up on a stuck PDF; stop here too if it never says so
+                    if (++pendingPolls >= MAX_PDF_POLLS) {
+                        clearInterval(pollTimer);
+                        pollTimer = null;
+                        toast('⚠️ The PDF report is taking too long; check History later.', true);
+                    }
+                    return;
+                }
+                if (!pdfPending) {
+                    clearInterval(pollTimer);
+                    pollTimer = null;
+                }
                 hideLoader();
                 renderResults(data.result);
-                toast('✅ Functional tests completed!');
+                if (!renderedPending) toast('✅ Functional tests completed!');
+                renderedPending = pdfPending;
             } else if (data.status === 'failed') {
                 clearInterval(pollTimer);
                 pollTimer = null;
@@ -256,6 +275,8 @@ function renderResults(result) {
 
     if (result.pdf_report_url) {
         html += `<a href="${result.pdf_report_url}" class="btn-download-issue" download>📄 Download PDF</a>`;
+    } else if (result.pdf_error) {
+        html += `<span style="color: #f87171; align-self: center;">⚠️ PDF report unavailable: ${escapeHtml(result.pdf_error)}</span>`;
     }
 
     html += `</div></div>`;
@@ -420,7 +441,8 @@ async function loadHistory(page = 1) {
                 <td><span style="color: #34d399; font-weight: 600;">${passed}</span></td>
                 <td><span style="color: #f87171; font-weight: 600;">${failed}</span></td>
                 <td>
-                    ${result.pdf_report_url ? `<a href="${result.pdf_report_url}" class="btn-download-issue" download>PDF</a>` : ''}
+                    ${result.pdf_report_url ? `<a href="${result.pdf_report_url}" class="btn-download-issue" download>PDF</a>`
+                        : result.pdf_error ? `<span style="color: #f87171;" title="${escapeHtml(result.pdf_error)}">⚠️ No PDF</span>` : ''}
                     <button onclick="viewHistoryResult('${job.job_id}')" class="btn-download-issue" style="cursor: pointer;">View</button>
                 </td>`;
             tbody.appendChild(row);
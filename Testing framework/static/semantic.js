@@ -21,6 +21,8 @@
 
     let currentJobId = null;
     let pollTimer = null;
+    // Re-polls while only the PDF is pending (~12 min at 800 ms)
+    const MAX_PDF_POLLS = 900;
     let currentPage = 1;
     let activeCategory = 'all';
 
@@ -92,6 +94,8 @@
     // ─── Poll Status ───
     function pollStatus() {
         if (!currentJobId) return;
+        let renderedPending = false;
+        let pendingPolls = 0;
 
         pollTimer = setInterval(async () => {
             try {
@@ -106,7 +110,19 @@
                 statusText.textContent = `${progress}% - ${step}`;
 
                 if (data.status === 'completed') {
-                    clearInterval(pollTimer);
+                    // The PDF renders after completion: show results now,
+                    // then once more when its download link is ready
+                    const pdfPending = !!(data.result && data.result.pdf_pending);
+                    if (!pdfPending) clearInterval(pollTimer);
+                    if (pdfPending && renderedPending) {
+                        // The server gives up on a stuck PDF; stop here too if it never says so
+                        if (++pendingPolls >= MAX_PDF_POLLS) {
+                            clearInterval(pollTimer);
+                            showToast('The PDF report is taking too long; check History later.', true);
+                        }
+                        return;
+                    }
+                    renderedPending = pdfPending;
                     loader.classList.add('hidden');
                     if (data.result && data.result.batch) {
                         renderBatchResults(data.result);
@@ -171,6 +187,8 @@
         html += `<div class="downloads" style="margin-bottom: 16px;">`;
         if (result.pdf_report_url) {
             html += `<a href="${result.pdf_report_url}" download>📄 Download PDF Report</a>`;
+        } else if (result.pdf_error) {
+            html += `<span style="color: #ef4444;">⚠️ PDF report unavailable: ${escapeHtml(result.pdf_error)}</span>`;
         }
         html += `</div>`;
 
@@ -371,6 +389,8 @@
         html += `<div class="downloads" style="margin-bottom: 16px;">`;
         if (result.pdf_report_url) {
             html += `<a href="${result.pdf_report_url}" download>📄 Download PDF Report</a>`;
+        } else if (result.pdf_error) {
+            html += `<span style="color: #ef4444;">⚠️ PDF report unavailable: ${escapeHtml(result.pdf_error)}</span>`;
         }
         html += `</div>`;
 
@@ -499,6 +519,8 @@
             let actions = '';
             if (job.result?.pdf_report_url) {
                 actions += `<a href="${job.result.pdf_report_url}" download class="btn-download-issue">📄 PDF</a> `;
+            } else if (job.result?.pdf_error) {
+                actions += `<span style="color: #ef4444;" title="${escapeHtml(job.result.pdf_error)}">⚠️ No PDF</span> `;
             }
             if (job.status === 'completed') {
                 actions += `<button class="btn-download-issue" onclick="viewHistoryResult('${job.job_id}')">👁️ View</button>`;
@@ -1,6 +1,8 @@
 
+import hashlib
 import json
 import os
+import shutil
 import threading
 from datetime import datetime
 from werkzeug.utils import secure_filename
@@ -33,7 +35,6 @@ class BaselineStore:
 
     def _get_url_key(self, url):
         # Create a safe key from URL
-        import hashlib
         return hashlib.md5(url.encode('utf-8')).hexdigest()
 
     def add_baseline(self, stage_url, job_id, image_path):
@@ -57,7 +58,6 @@ class BaselineStore:
                  if active_ver:
                      active_path = os.path.join(self.data_dir, active_ver["path"])
                      if os.path.exists(active_path):
-                         import hashlib
                          def file_hash(filepath):
                              hasher = hashlib.md5()
                              with open(filepath, 'rb') as f:
@@ -75,8 +75,6 @@ class BaselineStore:
 
             dest_filename = f"{key}_{version_id}{ext}"
             dest_path = os.path.join(self.data_dir, dest_filename)
-            
-            import shutil
             shutil.copy2(image_path, dest_path)
             
             new_version = {
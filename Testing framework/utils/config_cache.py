@@ -0,0 +1,55 @@
+"""
+Parsed-JSON cache for the small config files (GitHub, Jira) that request
+handlers read on every call. A file is re-read only when its mtime or size
+changes, so edits made on disk or by save_config are picked up immediately.
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+_cache = {}  # path -> ((st_mtime_ns, st_size), parsed dict)
+_lock = threading.Lock()
+
+
+def load_json_config(path):
+    """
+    Return the parsed JSON object in `path`, or {} if the file doesn't exist.
+    The result is a shallow copy, so callers may update it freely.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+
+    with _lock:
+        cached = _cache.get(path)
+    if cached is not None and cached[0] == key:
+        return dict(cached[1])
+
+    with open(path, "r") as f:
+        data = json.load(f)
+    with _lock:
+        _cache[path] = (key, data)
+    return dict(data)
+
+
+def save_json_config(path, data):
+    """
+    Write `data` to `path` as indented JSON, atomically: the file is written
+    under a temp name in the same directory and renamed over the original,
+    so a crash never leaves a torn config. Skips the write if the file
+    already holds exactly `data`.
+    """
+    if os.path.exists(path) and load_json_config(path) == data:
+        return
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,168 @@
+"""
+Git operations for the git push job: stage everything, commit, and count the
+commits not yet on origin.
+
+With pygit2 (libgit2) installed these steps run in-process instead of
+spawning a git process for each one. libgit2 doesn't run commit hooks, so a
+repository with any falls back to the git CLI, as does a machine without
+pygit2. Both backends honour GIT_AUTHOR_* / GIT_COMMITTER_* from the job's
+environment. The push itself always goes through the git CLI so the user's
+credential helpers and SSH agent keep working.
+"""
+
+import os
+import subprocess
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+if pygit2 is not None:
+    _WT_CHANGED = (pygit2.GIT_STATUS_WT_NEW | pygit2.GIT_STATUS_WT_MODIFIED |
+                   pygit2.GIT_STATUS_WT_TYPECHANGE | pygit2.GIT_STATUS_WT_RENAMED)
+
+# Hooks `git commit` runs that libgit2 would skip
+COMMIT_HOOKS = ("pre-commit", "prepare-commit-msg", "commit-msg", "post-commit")
+
+
+class GitOpError(Exception):
+    """A staging or commit step failed; the message is git's own error."""
+
+
+class CliRepo:
+    """Each step runs the git CLI in the work tree."""
+
+    def __init__(self, workdir, env):
+        self.workdir = workdir
+        self.env = env
+
+    def _git(self, *args, timeout=15):
+        return subprocess.run(["git", *args], cwd=self.workdir, capture_output=True,
+                              text=True, timeout=timeout, env=self.env)
+
+    def stage_all(self):
+        """`git add .`; returns True if the index now differs from HEAD."""
+        result = self._git("add", ".")
+        if result.returncode != 0:
+            raise GitOpError(result.stderr)
+        # returncode 1 = has changes
+        return self._git("diff", "--cached", "--quiet", timeout=10).returncode != 0
+
+    def commit(self, message):
+        # --no-edit so no editor ever opens
+        result = self._git("commit", "--no-edit", "-m", message)
+        if result.returncode != 0:
+            combined = result.stdout + result.stderr
+            # Nothing to commit: fall through, there may still be unpushed commits
+            if "nothing to commit" not in combined and "nothing added to commit" not in combined:
+                raise GitOpError(result.stderr)
+
+    def commits_ahead(self, branch):
+        """Number of commits in HEAD that are not in origin/<branch> (0 if unknown)."""
+        result = self._git("rev-list", "--count", f"origin/{branch}..HEAD", timeout=10)
+        if result.returncode != 0:
+            return 0
+        try:
+            return int(result.stdout.strip())
+        except ValueError:
+            return 0
+
+
+class Pygit2Repo:
+    """The same steps as CliRepo, in-process through libgit2."""
+
+    def __init__(self, repo, env):
+        self.repo = repo
+        self.env = env
+        self.workdir = repo.workdir.rstrip(os.sep)
+
+    def stage_all(self):
+        """
+        Equivalent of `git add .` at the work tree root: stages new, modified
+        and deleted files.
+
+        Returns:
+            True if the index now differs from HEAD
+        """
+        try:
+            repo = self.repo
+            index = repo.index
+            for path, flags in repo.status().items():
+                if flags & pygit2.GIT_STATUS_WT_DELETED:
+                    index.remove(path)
+                elif flags & _WT_CHANGED:
+                    index.add(path)
+            index.write()
+
+            tree_id = index.write_tree()
+            if repo.head_is_unborn:
+                return len(index) > 0
+            return tree_id != repo.head.peel(pygit2.Tree).id
+        except Exception as e:
+            raise GitOpError(str(e)) from e
+
+    def _env_signature(self, role):
+        name = self.env.get(f"GIT_{role}_NAME")
+        email = self.env.get(f"GIT_{role}_EMAIL")
+        return pygit2.Signature(name, email) if name and email else None
+
+    def commit(self, message):
+        """Commit the current index on HEAD."""
+        repo = self.repo
+        try:
+            default = repo.default_signature
+        except (KeyError, pygit2.GitError):
+            default = None  # No user.name/user.email configured
+        committer = self._env_signature("COMMITTER") or default
+        author = self._env_signature("AUTHOR") or default or committer
+        if author is None:
+            raise GitOpError("No git identity: set user.name and user.email")
+        try:
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            repo.create_commit("HEAD", author, committer or author, message,
+                               repo.index.write_tree(), parents)
+        except Exception as e:
+            raise GitOpError(str(e)) from e
+
+    def commits_ahead(self, branch):
+        """Number of commits in HEAD that are not in origin/<branch> (0 if unknown)."""
+        repo = self.repo
+        remote_ref = repo.references.get(f"refs/remotes/origin/{branch}")
+        if remote_ref is None or repo.head_is_unborn:
+            return 0
+        ahead, _behind = repo.ahead_behind(repo.head.target, remote_ref.resolve().target)
+        return ahead
+
+
+def _has_commit_hooks(repo):
+    try:
+        hooks_dir = repo.config["core.hooksPath"]
+    except KeyError:
+        hooks_dir = os.path.join(repo.path, "hooks")
+    hooks_dir = os.path.join(repo.workdir, os.path.expanduser(hooks_dir))
+    return any(os.access(os.path.join(hooks_dir, hook), os.X_OK) for hook in COMMIT_HOOKS)
+
+
+def open_repo(path, env):
+    """
+    Return the backend for the repository containing `path`: Pygit2Repo when
+    pygit2 is installed and the repository has no commit hooks, else CliRepo.
+    `env` is the environment the git steps run with.
+    """
+    if pygit2 is not None:
+        try:
+            found = pygit2.discover_repository(path)
+            repo = pygit2.Repository(found) if found is not None else None
+        except pygit2.GitError:
+            repo = None
+        if repo is not None and not repo.is_bare and not _has_commit_hooks(repo):
+            return Pygit2Repo(repo, env)
+
+    # Push from the work tree root so changes outside `path` are included too
+    try:
+        workdir = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=path,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        workdir = path
+    return CliRepo(workdir, env)
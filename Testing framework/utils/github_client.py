@@ -3,31 +3,42 @@ GitHub API Client — Full PR Validation & CI/CD Integration
 Handles: commit status, PR comments, issue creation, webhook verification
 """
 
-import json
 import os
 import hashlib
 import hmac
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+from utils.config_cache import load_json_config, save_json_config
+from utils.ttl_cache import TTLCache
 
 GITHUB_API = "https://api.github.com"
+STATUS_CONTEXT = "visual-regression/qa-framework"  # commit status check name
 CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "github_config.json")
 
+# GET responses kept for conditional requests: (url, params, auth) -> (fetched_at, etag, json).
+# Within `fresh_for` seconds a cached body is returned as is; after that the
+# request is revalidated with If-None-Match, and GitHub's 304s don't count
+# against the rate limit.
+_get_cache = TTLCache(maxsize=512, ttl=3600)
+
+# Last commit status posted per (owner, repo, sha, context), to skip repeats
+_posted_statuses = TTLCache(maxsize=1024, ttl=24 * 3600)
+
 
 def load_config():
-    """Load GitHub config from file."""
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    """Load GitHub config from file (cached until the file changes)."""
+    return load_json_config(CONFIG_FILE)
 
 
 def save_config(data: dict):
     """Save GitHub config to file."""
     existing = load_config()
     existing.update(data)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(existing, f, indent=2)
+    save_json_config(CONFIG_FILE, existing)
 
 
 def get_headers(token: str = None) -> dict:
@@ -55,10 +66,35 @@ def test_connection() -> dict:
         return {"success": False, "error": str(e)}
 
 
+def _cached_get(url: str, params: dict = None, fresh_for: float = 60, timeout: int = 10):
+    """
+    GET a GitHub API URL through _get_cache.
+    Returns (status_code, parsed JSON or None); a 304 is reported as 200.
+    """
+    headers = get_headers()
+    key = (url, tuple(sorted((params or {}).items())), headers["Authorization"])
+    cached = _get_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < fresh_for:
+        return 200, cached[2]
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+
+    r = requests.get(url, headers=headers, params=params, timeout=timeout)
+    if r.status_code == 304 and cached:
+        _get_cache[key] = (now, cached[1], cached[2])
+        return 200, cached[2]
+    if r.status_code != 200:
+        return r.status_code, None
+    data = r.json()
+    _get_cache[key] = (now, r.headers.get("ETag"), data)
+    return 200, data
+
+
 # ─── Commit Status ───────────────────────────────────────────────────────────
 
 def post_commit_status(sha: str, state: str, description: str,
-                       context: str = "visual-regression/qa-framework",
+                       context: str = STATUS_CONTEXT,
                        target_url: str = "") -> dict:
     """
     Post a commit status check.
@@ -77,10 +113,16 @@ def post_commit_status(sha: str, state: str, description: str,
     if target_url:
         payload["target_url"] = target_url
 
+    # GitHub keeps the latest status per context; re-posting the same one is a wasted call
+    status_key = (owner, repo, sha, context)
+    if _posted_statuses.get(status_key) == payload:
+        return {"success": True, "skipped": True}
+
     url = f"{GITHUB_API}/repos/{owner}/{repo}/statuses/{sha}"
     try:
         r = requests.post(url, headers=get_headers(), json=payload, timeout=15)
         if r.status_code == 201:
+            _posted_statuses[status_key] = payload
             return {"success": True, "data": r.json()}
         return {"success": False, "error": f"HTTP {r.status_code}: {r.text[:300]}"}
     except Exception as e:
@@ -126,9 +168,11 @@ def find_bot_comment(pr_number: int, marker: str = "<!-- qa-visual-bot -->") ->
     owner, repo = cfg.get("owner", ""), cfg.get("repo", "")
     url = f"{GITHUB_API}/repos/{owner}/{repo}/issues/{pr_number}/comments"
     try:
-        r = requests.get(url, headers=get_headers(), params={"per_page": 50}, timeout=10)
-        if r.status_code == 200:
-            for c in r.json():
+        # Always revalidated (our own comment may have just been posted), but
+        # an unchanged comment list comes back as a free 304
+        status, comments = _cached_get(url, params={"per_page": 50}, fresh_for=0)
+        if status == 200:
+            for c in comments:
                 if marker in c.get("body", ""):
                     return c["id"]
     except Exception:
@@ -145,6 +189,19 @@ def upsert_pr_comment(pr_number: int, body: str, marker: str = "<!-- qa-visual-b
     return post_pr_comment(pr_number, full_body)
 
 
+def finalize_pr(sha: str, state: str, description: str, pr_number: int, comment: str) -> dict:
+    """
+    Post the final commit status and the PR comment for a finished run. The two
+    calls go out concurrently, so the run waits one GitHub round trip, not two.
+    Either step is skipped when its sha / pr_number is empty.
+    """
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="gh-finalize") as pool:
+        status = pool.submit(post_commit_status, sha=sha, state=state, description=description) if sha else None
+        posted = pool.submit(upsert_pr_comment, pr_number, comment) if pr_number else None
+        return {"status": status.result() if status else None,
+                "comment": posted.result() if posted else None}
+
+
 # ─── PR Info ─────────────────────────────────────────────────────────────────
 
 def get_pr_info(pr_number: int) -> dict:
@@ -153,9 +210,8 @@ def get_pr_info(pr_number: int) -> dict:
     owner, repo = cfg.get("owner", ""), cfg.get("repo", "")
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls/{pr_number}"
     try:
-        r = requests.get(url, headers=get_headers(), timeout=10)
-        if r.status_code == 200:
-            d = r.json()
+        status, d = _cached_get(url)
+        if status == 200:
             return {
                 "success": True,
                 "number": d["number"],
@@ -171,7 +227,7 @@ def get_pr_info(pr_number: int) -> dict:
                 "created_at": d.get("created_at"),
                 "updated_at": d.get("updated_at"),
             }
-        return {"success": False, "error": f"HTTP {r.status_code}"}
+        return {"success": False, "error": f"HTTP {status}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -182,10 +238,10 @@ def list_open_prs() -> dict:
     owner, repo = cfg.get("owner", ""), cfg.get("repo", "")
     url = f"{GITHUB_API}/repos/{owner}/{repo}/pulls"
     try:
-        r = requests.get(url, headers=get_headers(), params={"state": "open", "per_page": 30}, timeout=10)
-        if r.status_code == 200:
+        status, data = _cached_get(url, params={"state": "open", "per_page": 30})
+        if status == 200:
             prs = []
-            for d in r.json():
+            for d in data:
                 prs.append({
                     "number": d["number"],
                     "title": d["title"],
@@ -197,7 +253,7 @@ def list_open_prs() -> dict:
                     "draft": d.get("draft", False),
                 })
             return {"success": True, "prs": prs}
-        return {"success": False, "error": f"HTTP {r.status_code}"}
+        return {"success": False, "error": f"HTTP {status}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -228,6 +284,12 @@ def create_issue(title: str, body: str, labels: list = None) -> dict:
 
 # ─── Webhook Verification ─────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4)
+def _keyed_mac(secret: str):
+    # HMAC with the key already mixed in; copies skip the key setup per webhook
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
 def verify_webhook_signature(payload_bytes: bytes, signature_header: str, secret: str) -> bool:
     """Verify GitHub webhook HMAC-SHA256 signature."""
     if not signature_header or not secret:
@@ -236,7 +298,8 @@ def verify_webhook_signature(payload_bytes: bytes, signature_header: str, secret
         algo, sig = signature_header.split("=", 1)
         if algo != "sha256":
             return False
-        mac = hmac.new(secret.encode(), payload_bytes, hashlib.sha256)
+        mac = _keyed_mac(secret).copy()
+        mac.update(payload_bytes)
         return hmac.compare_digest(mac.hexdigest(), sig)
     except Exception:
         return False
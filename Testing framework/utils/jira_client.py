@@ -1,7 +1,8 @@
 import os
-import json
 from jira import JIRA
 
+from utils.config_cache import load_json_config, save_json_config
+
 class JiraClient:
     def __init__(self, server, email, token):
         self.server = server
@@ -58,16 +59,11 @@ class JiraClient:
             "token": token,
             "project_key": project_key
         }
-        with open(JiraClient.get_config_path(), "w") as f:
-            json.dump(config, f, indent=2)
+        save_json_config(JiraClient.get_config_path(), config)
 
     @staticmethod
     def load_config():
-        path = JiraClient.get_config_path()
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        try:
+            return load_json_config(JiraClient.get_config_path())
+        except:
+            return {}
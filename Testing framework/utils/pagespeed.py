@@ -1,7 +1,28 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import threading
 import time
 
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session():
+    """
+    Shared keep-alive session for all PSI calls, so repeated analyses reuse
+    pooled TLS connections to googleapis.com instead of reconnecting each time.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+                _session = session
+    return _session
+
+
 class PageSpeedInsights:
     """
     Wrapper for Google PageSpeed Insights API
@@ -50,7 +71,7 @@ class PageSpeedInsights:
         
         for attempt in range(max_retries + 1):
             try:
-                response = requests.get(self.base_url, params=params, timeout=60)
+                response = _get_session().get(self.base_url, params=params, timeout=60)
                 response.raise_for_status()
                 return self._parse_response(response.json())
                 
@@ -85,7 +106,8 @@ class PageSpeedInsights:
                     continue
                 raise Exception(f"PageSpeed Insights API error: {str(e)}")
     
-    def _parse_response(self, data):
+    @staticmethod
+    def _parse_response(data):
         """
         Parse PageSpeed Insights API response
         
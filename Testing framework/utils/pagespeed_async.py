@@ -0,0 +1,139 @@
+"""
+Async PageSpeed Insights runner for large URL batches.
+
+Every request runs on a single event loop with one shared aiohttp session,
+so a sitemap with hundreds of URLs doesn't need a thread per in-flight request.
+"""
+
+import asyncio
+
+import aiohttp
+
+from utils.pagespeed import PageSpeedInsights
+
+PSI_ENDPOINT = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
+
+
+async def analyze(session, url, strategy='desktop', categories=None, api_key=None):
+    """
+    Async equivalent of PageSpeedInsights.analyze()
+
+    Args:
+        session: Shared aiohttp.ClientSession
+        url: URL to analyze
+        strategy: 'desktop' or 'mobile'
+        categories: List of categories to analyze (performance, accessibility, best-practices, seo)
+        api_key: Google API key (optional)
+
+    Returns:
+        Parsed metrics dictionary (same shape as PageSpeedInsights.analyze)
+    """
+    if categories is None:
+        categories = ['performance', 'accessibility', 'best-practices', 'seo']
+
+    params = [('url', url), ('strategy', strategy)]
+    params.extend(('category', c) for c in categories)
+    if api_key:
+        params.append(('key', api_key))
+
+    max_retries = 3
+    retry_delay = 5  # Start with 5 seconds
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    for attempt in range(max_retries + 1):
+        try:
+            async with session.get(PSI_ENDPOINT, params=params, timeout=timeout) as response:
+                # Handle API Key errors (400, 401, 403) - Retry WITHOUT key
+                if response.status in (400, 401, 403) and any(k == 'key' for k, _ in params):
+                    print(f"API Key failed with {response.status}, retrying without key...")
+                    params = [p for p in params if p[0] != 'key']
+                    continue
+
+                # Handle Rate Limit (429) - Backoff and Retry
+                if response.status == 429:
+                    if attempt < max_retries:
+                        print(f"Rate limit exceeded (429). Retrying in {retry_delay} seconds...")
+                        await asyncio.sleep(retry_delay)
+                        retry_delay *= 2  # Exponential backoff
+                        continue
+                    raise Exception(
+                        "PageSpeed Insights API rate limit exceeded even after retries.\n"
+                        "Please try again later or use a valid Google API Key."
+                    )
+
+                if response.status >= 400:
+                    raise Exception(f"PageSpeed Insights API error: HTTP {response.status} for url: {url}")
+
+                return PageSpeedInsights._parse_response(await response.json())
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Retry network errors
+            if attempt < max_retries:
+                print(f"Network error: {e}. Retrying in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+                continue
+            raise Exception(f"PageSpeed Insights API error: {str(e)}")
+
+    raise Exception("PageSpeed Insights API error: retries exhausted")
+
+
+async def _analyze_one(session, semaphore, url, strategy, categories, api_key):
+    # One semaphore slot per PSI request, so 'both' can't double the quota
+    async def request(strategy):
+        async with semaphore:
+            return await analyze(session, url, strategy, categories, api_key)
+
+    if strategy == 'both':
+        # Desktop and mobile are independent requests; overlap them
+        return tuple(await asyncio.gather(request('desktop'), request('mobile')))
+    return await request(strategy)
+
+
+async def _analyze_all(urls, strategy, categories, api_key, concurrency, on_result):
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def run(url):
+            try:
+                metrics = await _analyze_one(session, semaphore, url, strategy, categories, api_key)
+            except Exception as e:
+                on_result(url, None, e)
+            else:
+                on_result(url, metrics, None)
+
+        if isinstance(urls, (list, tuple)):
+            await asyncio.gather(*(run(url) for url in urls))
+            return
+
+        # Lazy source (e.g. a sitemap being fetched): pull each URL on a worker
+        # thread so the blocking fetch doesn't stall requests already in flight
+        loop = asyncio.get_running_loop()
+        source = iter(urls)
+        done = object()
+        tasks = []
+        while True:
+            url = await loop.run_in_executor(None, next, source, done)
+            if url is done:
+                break
+            tasks.append(asyncio.ensure_future(run(url)))
+        await asyncio.gather(*tasks)
+
+
+def analyze_urls(urls, strategy, categories, api_key=None, concurrency=8, on_result=None):
+    """
+    Analyze many URLs concurrently. Blocks until every URL has finished.
+
+    Args:
+        urls: URLs to analyze. A list is dispatched at once; any other iterable
+            is consumed lazily, starting each URL as soon as it is produced.
+        strategy: 'desktop', 'mobile' or 'both'
+        categories: List of categories to analyze
+        api_key: Google API key (optional)
+        concurrency: Maximum number of PSI requests in flight at once ('both'
+            makes two per URL)
+        on_result: Callback invoked as on_result(url, metrics, error) when each
+            URL finishes. For 'both', metrics is a (desktop, mobile) tuple.
+    """
+    if on_result is None:
+        on_result = lambda url, metrics, error: None
+    asyncio.run(_analyze_all(urls, strategy, categories, api_key, concurrency, on_result))
@@ -0,0 +1,111 @@
+"""
+Tracking for PR visual-test runs.
+
+By default runs live in this process (a bounded TTLCache). With REDIS_URL set
+and the redis package installed they are kept in Redis instead, so every web
+worker sees the same runs and a duplicate webhook for a commit that another
+worker is already testing is dropped.
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import MutableMapping
+
+from utils.ttl_cache import TTLCache
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+PR_RUN_TTL = 7 * 24 * 3600      # seconds a run stays listed after its last update
+PR_CLAIM_TTL = 60 * 60          # a crashed worker's claim on a commit expires after this
+
+
+class RedisRunMap(MutableMapping):
+    """pr_number -> run dict, stored as one JSON string per run under `prefix`."""
+
+    def __init__(self, client, prefix="pr_run:", ttl=PR_RUN_TTL):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def __getitem__(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            raise KeyError(key)
+        return json.loads(raw)
+
+    def __setitem__(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def __delitem__(self, key):
+        if not self.client.delete(self.prefix + key):
+            raise KeyError(key)
+
+    def _keys(self):
+        return list(self.client.scan_iter(match=self.prefix + "*", count=500))
+
+    def __iter__(self):
+        start = len(self.prefix)
+        return iter([k.decode()[start:] if isinstance(k, bytes) else k[start:] for k in self._keys()])
+
+    def __len__(self):
+        return len(self._keys())
+
+    def expire(self):
+        """Redis drops expired runs itself; nothing to do."""
+
+    def values(self):
+        # One MGET round trip instead of a GET per run
+        keys = self._keys()
+        if not keys:
+            return []
+        return [json.loads(raw) for raw in self.client.mget(keys) if raw is not None]
+
+
+class RedisClaims:
+    """Per-commit claims (SET NX PX), shared across workers."""
+
+    def __init__(self, client, prefix="pr_claim:", ttl=PR_CLAIM_TTL):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_ms = int(ttl * 1000)
+
+    def claim(self, sha):
+        return bool(self.client.set(self.prefix + sha, 1, nx=True, px=self.ttl_ms))
+
+    def release(self, sha):
+        self.client.delete(self.prefix + sha)
+
+
+class LocalClaims:
+    """In-process counterpart of RedisClaims."""
+
+    def __init__(self, ttl=PR_CLAIM_TTL):
+        self.ttl = ttl
+        self._claims = {}  # sha -> expires_at
+        self._lock = threading.Lock()
+
+    def claim(self, sha):
+        now = time.monotonic()
+        with self._lock:
+            if self._claims.get(sha, 0) > now:
+                return False
+            self._claims[sha] = now + self.ttl
+            return True
+
+    def release(self, sha):
+        with self._lock:
+            self._claims.pop(sha, None)
+
+
+def make_pr_run_tracking():
+    """Return (runs mapping, commit claims) for the configured backend."""
+    url = os.environ.get("REDIS_URL")
+    if url and redis is not None:
+        client = redis.Redis.from_url(url)
+        return RedisRunMap(client), RedisClaims(client)
+    return TTLCache(maxsize=1000, ttl=PR_RUN_TTL), LocalClaims()
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_TTL = int(os.environ.get("PSI_CACHE_TTL", 6 * 60 * 60))
+
+
+class PSICache:
+    """
+    Small SQLite-backed cache of parsed PageSpeed Insights results, keyed on
+    (url, strategy, categories). Entries expire after `ttl` seconds.
+    """
+
+    def __init__(self, filepath="psi_cache.sqlite", ttl=DEFAULT_TTL):
+        self.filepath = filepath
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(filepath, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS psi_results "
+                "(key TEXT PRIMARY KEY, expires REAL NOT NULL, metrics TEXT NOT NULL)"
+            )
+        self.purge_expired()
+
+    @staticmethod
+    def _key(url, strategy, categories):
+        raw = f"{url}|{strategy}|{','.join(sorted(categories or []))}"
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, url, strategy, categories):
+        key = self._key(url, strategy, categories)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT metrics FROM psi_results WHERE key = ? AND expires > ?",
+                (key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, url, strategy, categories, metrics):
+        key = self._key(url, strategy, categories)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO psi_results (key, expires, metrics) VALUES (?, ?, ?)",
+                (key, time.time() + self.ttl, json.dumps(metrics)),
+            )
+
+    def purge_expired(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM psi_results WHERE expires <= ?", (time.time(),))
+
+
+# Singleton instance
+psi_cache = PSICache(os.path.join(os.path.dirname(os.path.dirname(__file__)), "psi_cache.sqlite"))
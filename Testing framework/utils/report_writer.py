@@ -0,0 +1,111 @@
+"""
+Single-pass writers for batch job reports.
+
+write_batch_reports walks the result rows once, streaming each row into the
+Excel workbook while collecting the statistics and table rows the PDF needs,
+instead of building a DataFrame and then re-reading the rows for the PDF.
+"""
+
+import os
+from contextlib import contextmanager
+
+from reportlab.lib.styles import getSampleStyleSheet
+
+from utils.seo_performance_report import batch_detail_row, build_batch_seo_pdf
+
+
+@contextmanager
+def xlsx_row_writer(path):
+    """
+    Yield a write_row(values, bold=False) function that appends one row to a
+    new .xlsx file. Uses xlsxwriter's constant_memory mode when installed,
+    else openpyxl's write-only workbook; both flush rows as they go.
+    """
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        wb = xlsxwriter.Workbook(path, {'constant_memory': True})
+        ws = wb.add_worksheet()
+        bold = wb.add_format({'bold': True})
+        next_row = [0]
+
+        def write_row(values, bold_row=False):
+            ws.write_row(next_row[0], 0, values, bold if bold_row else None)
+            next_row[0] += 1
+
+        try:
+            yield write_row
+        finally:
+            wb.close()
+        return
+
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+
+    def write_row(values, bold_row=False):
+        if bold_row:
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.font = Font(bold=True)
+                cells.append(cell)
+            values = cells
+        ws.append(values)
+
+    yield write_row
+    wb.save(path)
+
+
+def write_batch_reports(results, job_dir, job_id, test_type='both'):
+    """
+    Write the Excel and PDF reports for a batch SEO/Performance job.
+
+    Returns:
+        (xlsx_path, pdf_path)
+    """
+    xlsx_path = os.path.join(job_dir, f"seo_performance_report_{job_id}.xlsx")
+    pdf_path = os.path.join(job_dir, "batch_report.pdf")
+
+    # Excel columns in first-seen order (same as pd.DataFrame(results));
+    # the header has to be written before any streamed row
+    columns = list(dict.fromkeys(key for r in results for key in r))
+    styles = getSampleStyleSheet()
+
+    total = success = 0
+    seo_sum = seo_count = perf_sum = perf_count = 0
+    has_dual = False
+    det_rows = []
+
+    with xlsx_row_writer(xlsx_path) as write_row:
+        write_row(columns, bold_row=True)
+        for r in results:
+            write_row([r.get(col) for col in columns])
+
+            total += 1
+            if r.get('Status') == 'Success':
+                success += 1
+            seo = r.get('SEO Score')
+            if isinstance(seo, (int, float)):
+                seo_sum += seo
+                seo_count += 1
+            perf = r.get('Performance Score')
+            if isinstance(perf, (int, float)):
+                perf_sum += perf
+                perf_count += 1
+            if 'Perf (Desktop)' in r:
+                has_dual = True
+            det_rows.append(batch_detail_row(r, styles))
+
+    avg_seo = seo_sum / seo_count if seo_count else 0
+    avg_perf = perf_sum / perf_count if perf_count else 0
+
+    build_batch_seo_pdf(pdf_path, job_id, test_type, total, success,
+                        avg_seo, avg_perf, has_dual, det_rows, styles)
+    return xlsx_path, pdf_path
@@ -1,4 +1,19 @@
-from playwright.sync_api import sync_playwright
+import asyncio
+import atexit
+import threading
+
+from playwright.async_api import async_playwright
+
+# One Chromium process is launched on first use and kept for the life of the
+# process instead of a cold start per screenshot. It is driven from a private
+# event loop thread; capture_screenshot() can be called from any thread and
+# blocks until its capture finishes, and concurrent captures each get their
+# own browser context (cookies, storage, viewport) on the shared browser.
+_loop = None
+_loop_lock = threading.Lock()
+_playwright = None
+_browser = None
+_browser_lock = None  # asyncio.Lock, created on the loop thread
 
 VIEWPORTS = {
     "desktop": {"width": 1366, "height": 768},
@@ -14,21 +29,71 @@ def _parse_viewport(vp):
             return VIEWPORTS["desktop"]
     return VIEWPORTS.get(vp, VIEWPORTS["desktop"])
 
+async def _get_browser():
+    """The shared browser, launched on first use and relaunched if it has died."""
+    global _playwright, _browser, _browser_lock
+    if _browser_lock is None:
+        _browser_lock = asyncio.Lock()
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, args=["--no-sandbox"])
+    return _browser
+
+
+async def _close_browser():
+    global _playwright, _browser
+    if _browser is not None:
+        await _browser.close()
+    if _playwright is not None:
+        await _playwright.stop()
+    _playwright = _browser = None
+
+
+def _browser_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="screenshot-browser", daemon=True).start()
+            atexit.register(_shutdown)
+            _loop = loop
+    return _loop
+
+
+def _shutdown():
+    try:
+        asyncio.run_coroutine_threadsafe(_close_browser(), _loop).result(timeout=10)
+    except Exception:
+        pass
+
+
 def capture_screenshot(url, out_path, viewport="desktop", fullpage=True, wait="networkidle", mask_selectors=None, wait_time=1000, selector=None, remove_selectors=None, max_height=None):
     vp = _parse_viewport(viewport)
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-        context = browser.new_context(viewport=vp, device_scale_factor=1)
-        page = context.new_page()
+    future = asyncio.run_coroutine_threadsafe(
+        _capture(url, out_path, vp, fullpage, wait, mask_selectors, wait_time, selector, remove_selectors),
+        _browser_loop())
+    future.result()
+
+    # Post-process: crop to max height if specified
+    _crop_to_max_height(out_path, max_height)
+
+
+async def _capture(url, out_path, vp, fullpage, wait, mask_selectors, wait_time, selector, remove_selectors):
+    browser = await _get_browser()
+    context = await browser.new_context(viewport=vp, device_scale_factor=1)
+    try:
+        page = await context.new_page()
         page.set_default_timeout(60000)
         
         try:
-            page.goto(url, wait_until=wait, timeout=60000)
+            await page.goto(url, wait_until=wait, timeout=60000)
         except Exception as e:
             print(f"Navigation timeout/error: {e}")
             
         # Reduce visual noise from animations/caret
-        page.add_style_tag(content="""
+        await page.add_style_tag(content="""
           * { animation: none !important; transition: none !important; caret-color: transparent !important;}
         """)
         
@@ -36,7 +101,7 @@ def capture_screenshot(url, out_path, viewport="desktop", fullpage=True, wait="n
         # Step 1: Scroll entire page to trigger lazy-loaded images
         if fullpage:
             try:
-                page.evaluate("""
+                await page.evaluate("""
                     async () => {
                         const delay = ms => new Promise(r => setTimeout(r, ms));
                         const scrollHeight = document.body.scrollHeight;
@@ -62,7 +127,7 @@ def capture_screenshot(url, out_path, viewport="desktop", fullpage=True, wait="n
         
         # Step 2: Wait for all <img> elements to fully load
         try:
-            page.evaluate("""
+            await page.evaluate("""
                 () => {
                     return Promise.all(
                         Array.from(document.images)
@@ -85,12 +150,12 @@ def capture_screenshot(url, out_path, viewport="desktop", fullpage=True, wait="n
         
         # Step 3: Wait for web fonts to load (icon fonts like Font Awesome, Material Icons)
         try:
-            page.evaluate("() => document.fonts.ready")
+            await page.evaluate("() => document.fonts.ready")
         except Exception as e:
             print(f"Font load wait: {e}")
         
         # Step 4: Final settle wait for any remaining rendering
-        page.wait_for_timeout(500)
+        await page.wait_for_timeout(500)
         # ──────────────────────────────────────────────────────────
         
         # Remove sections from DOM (collapses space, reduces page height)
@@ -98,9 +163,9 @@ def capture_screenshot(url, out_path, viewport="desktop", fullpage=True, wait="n
             try:
                 selector_str = ", ".join([s.strip() for s in remove_selectors if s.strip()])
                 if selector_str:
-                    page.add_style_tag(content=f"{selector_str} {{ display: none !important; }}")
+                    await page.add_style_tag(content=f"{selector_str} {{ display: none !important; }}")
                     # Wait briefly for reflow
-                    page.wait_for_timeout(200)
+                    await page.wait_for_timeout(200)
             except Exception as e:
                 print(f"Error removing sections: {e}")
 
@@ -110,35 +175,29 @@ def capture_screenshot(url, out_path, viewport="desktop", fullpage=True, wait="n
                 selector_str = ", ".join([s.strip() for s in mask_selectors if s.strip()])
                 if selector_str:
                     # Hide elements completely
-                    page.add_style_tag(content=f"{selector_str} {{ visibility: hidden !important; opacity: 0 !important; }}")
+                    await page.add_style_tag(content=f"{selector_str} {{ visibility: hidden !important; opacity: 0 !important; }}")
             except Exception as e:
                 print(f"Error applying masks: {e}")
 
         # Custom wait before screenshot (user-defined extra time)
         if wait_time > 0:
-            page.wait_for_timeout(wait_time)
+            await page.wait_for_timeout(wait_time)
             
         # Component screenshot if selector provided
         if selector:
             try:
                 locator = page.locator(selector).first
-                if locator.count() > 0:
-                    locator.screenshot(path=out_path)
-                    context.close()
-                    browser.close()
-                    _crop_to_max_height(out_path, max_height)
+                if await locator.count() > 0:
+                    await locator.screenshot(path=out_path)
                     return
                 else:
                     print(f"Selector '{selector}' not found. Falling back to full page.")
             except Exception as e:
                  print(f"Error capturing element '{selector}': {e}. Falling back to full page.")
 
-        page.screenshot(path=out_path, full_page=fullpage)
-        context.close()
-        browser.close()
-    
-    # Post-process: crop to max height if specified
-    _crop_to_max_height(out_path, max_height)
+        await page.screenshot(path=out_path, full_page=fullpage)
+    finally:
+        await context.close()
 
 
 def _crop_to_max_height(image_path, max_height):
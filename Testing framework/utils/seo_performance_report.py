@@ -369,16 +369,46 @@ def generate_seo_performance_pdf(metrics, page_url, test_type, device_type, job_
     doc.build(elements)
     
     return pdf_path
-    
-def generate_batch_seo_pdf(results, job_id, output_dir, test_type='both'):
+
+
+def batch_detail_row(r, styles):
+    """
+    One row of the 'Detailed URL Analysis' table. Rows from a desktop+mobile
+    run use the dual layout; failed/skipped rows render as dashes in either.
+    """
+    # Truncate URL for display
+    url_text = r.get('URL', '')
+    disp_url = Paragraph(url_text, styles['Normal'])
+
+    if 'Perf (Desktop)' in r:
+        return [
+            disp_url,
+            r.get('SEO Score', '-'),
+            r.get('Perf (Desktop)', '-'),
+            r.get('Perf (Mobile)', '-'),
+            r.get('LCP (Mobile)', '-'),
+            r.get('Cumulative Layout Shift', '-')
+        ]
+    return [
+        disp_url,
+        r.get('SEO Score', '-'),
+        r.get('Performance Score', '-'),
+        r.get('Largest Contentful Paint', '-'),
+        r.get('Cumulative Layout Shift', '-'),
+        r.get('Time to First Byte', '-')
+    ]
+
+
+def build_batch_seo_pdf(pdf_path, job_id, test_type, total, success, avg_seo, avg_perf, has_dual, det_rows, styles=None):
     """
-    Generate a summary PDF for batch SEO/Performance jobs
+    Lay out the batch PDF from pre-computed statistics and detail rows
+    (see batch_detail_row).
     """
-    pdf_path = f"{output_dir}/batch_report.pdf"
     doc = SimpleDocTemplate(pdf_path, pagesize=letter)
     elements = []
-    styles = getSampleStyleSheet()
-    
+    styles = styles or getSampleStyleSheet()
+    failed = total - success
+
     # Title
     report_title = "Batch SEO & Performance Report"
     if test_type == "seo":
@@ -390,18 +420,6 @@ def generate_batch_seo_pdf(results, job_id, output_dir, test_type='both'):
     elements.append(Paragraph(f"Job ID: {job_id} | Date: {datetime.now().strftime('%Y-%m-%d')}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
-    # Statistics
-    total = len(results)
-    success = len([r for r in results if r.get('Status') == 'Success'])
-    failed = total - success
-    
-    # Calculate Averages (filtering out N/A)
-    seo_scores = [r.get('SEO Score') for r in results if isinstance(r.get('SEO Score'), (int, float))]
-    perf_scores = [r.get('Performance Score') for r in results if isinstance(r.get('Performance Score'), (int, float))]
-    
-    avg_seo = sum(seo_scores) / len(seo_scores) if seo_scores else 0
-    avg_perf = sum(perf_scores) / len(perf_scores) if perf_scores else 0
-    
     stats_data = [
         ['Total URLs', total],
         ['Successful Scans', success],
@@ -457,36 +475,11 @@ def generate_batch_seo_pdf(results, job_id, output_dir, test_type='both'):
     elements.append(Paragraph("Detailed URL Analysis", styles['Heading2']))
     
     # Table Header
-    has_dual = any('Perf (Desktop)' in r for r in results)
-    
     if has_dual:
         det_data = [['URL', 'SEO', 'Perf (D)', 'Perf (M)', 'LCP (M)', 'CLS']]
     else:
         det_data = [['URL', 'SEO', 'Perf', 'LCP', 'CLS', 'TTFB']]
-    
-    for r in results:
-        # Truncate URL for display
-        url_text = r.get('URL', '')
-        disp_url = Paragraph(url_text, styles['Normal'])
-        
-        if has_dual:
-             det_data.append([
-                disp_url,
-                r.get('SEO Score', '-'),
-                r.get('Perf (Desktop)', '-'),
-                r.get('Perf (Mobile)', '-'),
-                r.get('LCP (Mobile)', '-'),
-                r.get('Cumulative Layout Shift', '-')
-            ])
-        else:
-            det_data.append([
-                disp_url,
-                r.get('SEO Score', '-'),
-                r.get('Performance Score', '-'),
-                r.get('Largest Contentful Paint', '-'),
-                r.get('Cumulative Layout Shift', '-'),
-                r.get('Time to First Byte', '-')
-            ])
+    det_data.extend(det_rows)
         
     t_det = Table(det_data, colWidths=[2.5*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch, 0.7*inch], repeatRows=1)
     t_det.setStyle(TableStyle([
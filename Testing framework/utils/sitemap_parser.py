@@ -1,20 +1,28 @@
 import requests
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from lxml import etree
 import re
 
-def fetch_sitemap_urls(sitemap_url, visited=None):
+def fetch_sitemap_urls(sitemap_url, visited=None, seen=None):
     """
     Fetch and parse a sitemap (XML) to extract all page URLs.
     Handles standard sitemaps and sitemap indexes.
+
+    This is a generator: page URLs are yielded (once each, in document order)
+    as every sitemap is parsed, so callers can start work on the first pages
+    while nested sitemaps are still being fetched.
     """
     if visited is None:
         visited = set()
+    if seen is None:
+        seen = set()
         
     if sitemap_url in visited:
-        return []
+        return
         
     visited.add(sitemap_url)
-    urls = set()
     
     try:
         headers = {
@@ -48,21 +56,69 @@ def fetch_sitemap_urls(sitemap_url, visited=None):
         # Fallback to regex if BS4 failed to find anything
         if not locs:
             locs = re.findall(r'<loc>(.*?)</loc>', response.text)
-            
-        for url in locs:
-            url = url.strip()
-            if not url: continue
-            
-            # Check if it's a nested sitemap
-            if url.endswith('.xml') or 'sitemap' in url.split('/')[-1]:
-                # Recursively fetch, but assume it's a sitemap index
-                # Avoid infinite recursion with visited set
-                sub_urls = fetch_sitemap_urls(url, visited)
-                urls.update(sub_urls)
-            else:
-                urls.add(url)
                     
     except Exception as e:
         print(f"Error parsing sitemap {sitemap_url}: {e}")
+        return
+        
+    for url in locs:
+        url = url.strip()
+        if not url: continue
         
-    return list(urls)
+        # Check if it's a nested sitemap
+        if url.endswith('.xml') or 'sitemap' in url.split('/')[-1]:
+            # Recursively fetch, but assume it's a sitemap index
+            # Avoid infinite recursion with visited set
+            yield from fetch_sitemap_urls(url, visited, seen)
+        elif url not in seen:
+            seen.add(url)
+            yield url
+
+
+def iter_sitemap_urls(sitemap_url, max_child_sitemaps=5, timeout=30, headers=None, child_limit=None):
+    """
+    Stream page URLs from a sitemap without building the whole XML tree.
+
+    <url> entries are yielded as they are parsed, so a caller that only needs
+    the first N URLs can stop early (e.g. itertools.islice) and the rest of the
+    document is never downloaded. For a sitemap index, the first
+    `max_child_sitemaps` child sitemaps are fetched in parallel (each reading
+    at most `child_limit` URLs) and yielded in index order. Errors fetching
+    the top-level sitemap are raised, but a document that isn't XML just
+    yields no URLs; errors in child sitemaps are skipped.
+    """
+    headers = headers or {"User-Agent": "QA-Testing-Framework/1.0"}
+    child_sitemaps = []
+
+    with requests.get(sitemap_url, headers=headers, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        try:
+            for _, elem in etree.iterparse(response.raw, tag=('{*}url', '{*}sitemap'), recover=True):
+                loc = (elem.findtext('{*}loc') or '').strip()
+                if loc:
+                    if etree.QName(elem).localname == 'url':
+                        yield loc
+                    elif len(child_sitemaps) < max_child_sitemaps:
+                        child_sitemaps.append(loc)
+                # Free parsed entries as we go
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        except etree.XMLSyntaxError as e:
+            # Empty or unparseable document: no (further) URLs, not a failed job
+            print(f"Error parsing sitemap {sitemap_url}: {e}")
+
+    if not child_sitemaps:
+        return
+
+    def read_child(child_url):
+        return list(islice(iter_sitemap_urls(child_url, 0, timeout, headers), child_limit))
+
+    with ThreadPoolExecutor(max_workers=len(child_sitemaps)) as pool:
+        futures = [(child_url, pool.submit(read_child, child_url)) for child_url in child_sitemaps]
+        for child_url, future in futures:
+            try:
+                yield from future.result()
+            except Exception as e:
+                print(f"Error parsing sitemap {child_url}: {e}")
@@ -1,12 +1,29 @@
 import json
 import os
+import tempfile
 import threading
+import time
 from datetime import datetime
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class JobStore:
     def __init__(self, filepath="runs.json"):
         self.filepath = filepath
         self.lock = threading.Lock()
+        # Parsed contents of the file, reused until its inode/mtime/size
+        # changes (another worker process may write it), plus a per-type index
+        # of jobs sorted newest first, rebuilt lazily after every change.
+        # Cached job dicts are never modified in place, only replaced, and
+        # callers get shallow copies, so a returned job can't change under
+        # its reader and a caller can't corrupt the cache.
+        self._cache_key = None
+        self._cache = None
+        self._by_type = None
         self._ensure_file()
 
     def _ensure_file(self):
@@ -14,16 +31,66 @@ class JobStore:
             with open(self.filepath, "w") as f:
                 json.dump({}, f)
 
+    def _stat_key(self):
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        # os.replace() gives the file a new inode even when mtime/size collide
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
     def _load(self):
+        key = self._stat_key()
+        if key is not None and key == self._cache_key:
+            return self._cache
         try:
-            with open(self.filepath, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            if orjson is not None:
+                with open(self.filepath, "rb") as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(self.filepath, "r") as f:
+                    data = json.load(f)
+        except (ValueError, FileNotFoundError):  # JSONDecodeError subclasses ValueError
+            data = {}
+        self._cache_key, self._cache, self._by_type = key, data, None
+        return data
 
     def _save(self, data):
-        with open(self.filepath, "w") as f:
-            json.dump(data, f, indent=2)
+        # Written to a temp file and renamed over the original, so another
+        # worker reading the file never sees a half-written one
+        try:
+            if orjson is not None:
+                body = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+            else:
+                body = json.dumps(data, indent=2).encode()
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.filepath) or ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(body)
+                try:
+                    # Keep the original file's permissions (mkstemp creates 0600)
+                    os.chmod(tmp_path, os.stat(self.filepath).st_mode & 0o777)
+                except FileNotFoundError:
+                    pass
+                os.replace(tmp_path, self.filepath)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            # data may have been modified in place; re-read it next time
+            self._cache_key = self._cache = self._by_type = None
+            raise
+        self._cache_key, self._cache, self._by_type = self._stat_key(), data, None
+
+    def _index(self, data):
+        # (all jobs, {type: jobs}), each newest first
+        if self._by_type is None:
+            all_jobs = sorted(data.values(), key=lambda x: x.get("created_at", ""), reverse=True)
+            by_type = {}
+            for job in all_jobs:
+                by_type.setdefault(job.get("type"), []).append(job)
+            self._by_type = (all_jobs, by_type)
+        return self._by_type
 
     def save_job(self, job_id, job_data):
         with self.lock:
@@ -32,25 +99,46 @@ class JobStore:
             if job_id not in data:
                 job_data["created_at"] = datetime.utcnow().isoformat()
             
-            # Merge or overwrite
-            if job_id in data:
-                data[job_id].update(job_data)
-            else:
-                data[job_id] = job_data
+            # Merge into a new dict rather than updating the cached one in place
+            data[job_id] = {**data.get(job_id, {}), **job_data}
             self._save(data)
 
     def get_job(self, job_id):
         with self.lock:
-            data = self._load()
-            return data.get(job_id)
+            job = self._load().get(job_id)
+        return None if job is None else dict(job)
 
-    def list_jobs(self):
+    def iter_jobs(self, job_type=None):
+        """
+        Lazily yield jobs of the given type(s), newest first, each a shallow
+        copy. job_type may be None (all jobs), a single type or a collection of
+        types. Iterates over the index as of the call; later writes don't
+        affect it.
+        """
         with self.lock:
-            data = self._load()
-            # Convert dict to list and sort by date desc
-            jobs = list(data.values())
-            jobs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-            return jobs
+            all_jobs, by_type = self._index(self._load())
+        if job_type is None:
+            jobs = all_jobs
+        elif isinstance(job_type, str):
+            jobs = by_type.get(job_type, ())
+        else:
+            types = set(job_type)
+            jobs = (j for j in all_jobs if j.get("type") in types)
+        return (dict(j) for j in jobs)
+
+    def list_jobs(self, job_type=None, offset=0, limit=None):
+        """Jobs of the given type(s), newest first, sliced to [offset:offset+limit]."""
+        end = None if limit is None else offset + limit
+        return list(islice(self.iter_jobs(job_type), offset, end))
+
+    def count_jobs(self, job_type=None):
+        with self.lock:
+            all_jobs, by_type = self._index(self._load())
+        if job_type is None:
+            return len(all_jobs)
+        if isinstance(job_type, str):
+            return len(by_type.get(job_type, ()))
+        return sum(len(by_type.get(t, ())) for t in set(job_type))
 
     def delete_job(self, job_id):
         with self.lock:
@@ -74,3 +162,51 @@ class JobStore:
 
 # Singleton instance
 store = JobStore(os.path.join(os.path.dirname(os.path.dirname(__file__)), "runs.json"))
+
+
+class ProgressThrottle:
+    """
+    Coalesces frequent progress updates for one job. The latest fields are kept
+    in memory and written at most once per `min_interval` seconds; a deferred
+    update is written by a timer once the interval has passed, so the last
+    step of a slow phase still shows up. Progress 0/100 and a completed/failed
+    status always go straight through. Call flush() before writing to the job
+    directly.
+    """
+
+    TERMINAL_STATUSES = ("completed", "failed")
+
+    def __init__(self, job_id, min_interval=1.0, job_store=None):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.store = job_store or store
+        self.pending = {}
+        self.last_flush = float("-inf")
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def update(self, **fields):
+        with self.lock:
+            self.pending.update(fields)
+            now = time.monotonic()
+            if (fields.get("progress") in (0, 100)
+                    or fields.get("status") in self.TERMINAL_STATUSES
+                    or now - self.last_flush >= self.min_interval):
+                self._flush(now)
+            elif self.timer is None:
+                self.timer = threading.Timer(self.last_flush + self.min_interval - now, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self.pending:
+                self._flush(time.monotonic())
+
+    def _flush(self, now):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.store.save_job(self.job_id, self.pending)
+        self.pending = {}
+        self.last_flush = now
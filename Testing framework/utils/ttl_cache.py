@@ -0,0 +1,62 @@
+"""
+Small dict-like cache bounded by size and age, for in-memory run tracking
+that would otherwise grow for the life of the process.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+
+class TTLCache(MutableMapping):
+    """
+    Mapping that holds at most `maxsize` entries, each dropped `ttl` seconds
+    after it was last set. When full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self._data = OrderedDict()  # key -> (expires_at, value), oldest use first
+        self._lock = threading.RLock()
+
+    def expire(self):
+        """Drop every entry whose TTL has passed."""
+        now = self.timer()
+        with self._lock:
+            for key in [k for k, (expires, _) in self._data.items() if expires <= now]:
+                del self._data[key]
+
+    def __getitem__(self, key):
+        with self._lock:
+            expires, value = self._data[key]
+            if expires <= self.timer():
+                del self._data[key]
+                raise KeyError(key)
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (self.timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self.expire()
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self):
+        with self._lock:
+            self.expire()
+            return iter(list(self._data))
+
+    def __len__(self):
+        with self._lock:
+            self.expire()
+            return len(self._data)
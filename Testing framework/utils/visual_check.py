@@ -0,0 +1,28 @@
+"""
+Compare-and-report step of a PR visual check.
+
+Kept as a top-level function outside app.py so it can be pickled onto the
+app's process pool: the numpy/OpenCV diff and the reportlab PDF then run off
+the GIL while other pages are still being captured.
+"""
+
+import os
+
+from utils.image_compare import compare_images
+from utils.report import build_pdf_report
+
+
+def compare_and_report(job_id, url, figma_path, stage_path, job_dir, compare_kwargs):
+    """
+    Diff the captured page against its baseline and write report.pdf.
+
+    Returns:
+        The compare_images() result; a failed PDF doesn't fail the check
+    """
+    cmp = compare_images(figma_path, stage_path, job_dir, highlight_diffs=True, **compare_kwargs)
+    try:
+        build_pdf_report(pdf_path=os.path.join(job_dir, "report.pdf"), job_id=job_id,
+                         stage_url=url, metrics=cmp, figma_path=figma_path)
+    except Exception:
+        pass
+    return cmp